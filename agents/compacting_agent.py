@@ -0,0 +1,238 @@
+"""
+ReActAgent variant that keeps its scratchpad (tool observations) from growing without bound.
+
+Every ReAct step resends the full list of reasoning steps, including complete
+file bodies returned by the read tools. After each batch of tool results this
+agent rewrites old observations as one-line references:
+  - observations from read tools issued before a ``record_notes`` call are
+    compacted right away, since their findings are already captured in notes;
+  - when the scratchpad exceeds ``history_token_ceiling`` (estimated tokens),
+    the oldest remaining observations are compacted until it fits, always
+    keeping the most recent ``keep_recent_observations`` intact. These calls are
+    marked in the run budget, so repeating one returns the full cached text
+    without the "do not repeat" warning.
+
+It also enforces the run budget (utils.budget): once a tool call of this agent
+was refused, the next step does not go back to the LLM with tools. The agent
+hands off to ``budget_handoff_to`` programmatically, or, without a handoff
+target, is asked for its final answer with no tools available.
+"""
+import os
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+from pydantic import Field
+from llama_index.core.agent.react.types import (
+    ActionReasoningStep,
+    BaseReasoningStep,
+    ObservationReasoningStep,
+    ResponseReasoningStep,
+)
+from llama_index.core.agent.workflow import AgentOutput, ReActAgent, ToolCallResult
+from llama_index.core.llms import ChatMessage
+from llama_index.core.memory import BaseMemory
+from llama_index.core.tools import AsyncBaseTool, ToolSelection
+from llama_index.core.workflow import Context
+
+from utils.budget import ACTIVE_BUDGET, CHARS_PER_TOKEN
+
+# 관찰 결과가 큰 읽기 도구 (압축 대상)
+COMPACTABLE_TOOLS = {
+    "read_file",
+    "read_file_chunk",
+    "read_files",
+    "get_file_outline",
+    "get_directory_structure",
+    "search_web",
+}
+NOTES_TOOL = "record_notes"
+COMPACTED_PREFIX = "[COMPACTED]"
+
+DEFAULT_HISTORY_TOKEN_CEILING = int(os.environ.get("README_AGENT_HISTORY_TOKEN_CEILING", 24000))
+
+HANDOFF_TOOL = "handoff"
+FORCED_ANSWER_PROMPT = (
+    "[BUDGET EXHAUSTED] No tools are available any more. "
+    "Reply now with 'Thought: ...' followed by 'Answer: ...' containing your final answer."
+)
+
+
+def _estimate_tokens(steps: List[BaseReasoningStep]) -> int:
+    return sum(len(step.get_content()) for step in steps) // CHARS_PER_TOKEN
+
+
+def _describe_action(action: Optional[ActionReasoningStep]) -> str:
+    if action is None:
+        return "tool call"
+
+    action_input: Dict[str, Any] = action.action_input or {}
+    targets = []
+    for key in ("file_path", "root_path", "path", "query"):
+        if key in action_input:
+            targets.append(str(action_input[key]))
+    if "paths" in action_input:
+        paths = action_input["paths"]
+        if isinstance(paths, list):
+            shown = ", ".join(str(p) for p in paths[:5])
+            targets.append(shown + (f", ... (+{len(paths) - 5})" if len(paths) > 5 else ""))
+        else:
+            targets.append(str(paths))
+    if "offset" in action_input:
+        targets.append(f"offset={action_input['offset']}")
+
+    return f"{action.action}({', '.join(targets)})"
+
+
+class CompactingReActAgent(ReActAgent):
+    history_token_ceiling: int = Field(
+        default=DEFAULT_HISTORY_TOKEN_CEILING,
+        description="Estimated token ceiling for the ReAct scratchpad before old observations are compacted.",
+    )
+    keep_recent_observations: int = Field(
+        default=2,
+        description="Number of most recent observations never compacted by the ceiling rule.",
+    )
+    budget_handoff_to: Optional[str] = Field(
+        default=None,
+        description="Agent to hand off to once a tool call was refused by the run budget; "
+        "None makes the agent finish with a final answer instead.",
+    )
+
+    async def take_step(
+        self,
+        ctx: Context,
+        llm_input: List[ChatMessage],
+        tools: Sequence[AsyncBaseTool],
+        memory: BaseMemory,
+    ) -> AgentOutput:
+        if not await self._budget_refused_since_last_step(ctx):
+            return await super().take_step(ctx, llm_input, tools, memory)
+
+        if self.budget_handoff_to and any(tool.metadata.name == HANDOFF_TOOL for tool in tools):
+            return await self._forced_handoff(ctx)
+        return await self._forced_answer(ctx, llm_input, memory)
+
+    async def handle_tool_call_results(
+        self, ctx: Context, results: List[ToolCallResult], memory: BaseMemory
+    ) -> None:
+        await super().handle_tool_call_results(ctx, results, memory)
+
+        current_reasoning: List[BaseReasoningStep] = await ctx.store.get(self.reasoning_key, default=[])
+        if self._compact(current_reasoning):
+            await ctx.store.set(self.reasoning_key, current_reasoning)
+
+    # ------------------------------------------------------------------
+    async def _budget_refused_since_last_step(self, ctx: Context) -> bool:
+        controller = ACTIVE_BUDGET.get()
+        if controller is None:
+            return False
+
+        # 새로 거부된 호출이 있을 때만 강제 (handoff 로 다시 돌아온 뒤에는 정상 진행)
+        refused = controller.usage_for(self.name).refused_calls
+        handled_key = f"{self.name}_handled_budget_refusals"
+        if refused <= await ctx.store.get(handled_key, default=0):
+            return False
+        await ctx.store.set(handled_key, refused)
+        return True
+
+    async def _forced_handoff(self, ctx: Context) -> AgentOutput:
+        action = ActionReasoningStep(
+            thought=f"My budget is exhausted, so I hand off to {self.budget_handoff_to} with what I have.",
+            action=HANDOFF_TOOL,
+            action_input={"to_agent": self.budget_handoff_to, "reason": "budget exhausted"},
+        )
+        current_reasoning: List[BaseReasoningStep] = await ctx.store.get(self.reasoning_key, default=[])
+        current_reasoning.append(action)
+        await ctx.store.set(self.reasoning_key, current_reasoning)
+
+        return AgentOutput(
+            response=ChatMessage(role="assistant", content=action.get_content()),
+            tool_calls=[
+                ToolSelection(tool_id=str(uuid.uuid4()), tool_name=HANDOFF_TOOL, tool_kwargs=action.action_input)
+            ],
+            current_agent_name=self.name,
+        )
+
+    async def _forced_answer(self, ctx: Context, llm_input: List[ChatMessage], memory: BaseMemory) -> AgentOutput:
+        output = await super().take_step(
+            ctx, [*llm_input, ChatMessage(role="user", content=FORCED_ANSWER_PROMPT)], [], memory
+        )
+        if not output.tool_calls:
+            return output
+
+        # 도구 없이도 action 을 고른 경우: action 을 버리고 그 thought 를 최종 답변으로 사용
+        current_reasoning: List[BaseReasoningStep] = await ctx.store.get(self.reasoning_key, default=[])
+        thought = ""
+        if current_reasoning and isinstance(current_reasoning[-1], ActionReasoningStep):
+            thought = current_reasoning.pop().thought
+        answer = ResponseReasoningStep(thought=thought, response=thought or "(budget exhausted)", is_streaming=False)
+        current_reasoning.append(answer)
+        await ctx.store.set(self.reasoning_key, current_reasoning)
+
+        return AgentOutput(
+            response=ChatMessage(role="assistant", content=answer.get_content()),
+            current_agent_name=self.name,
+        )
+
+    def _compact(self, steps: List[BaseReasoningStep]) -> bool:
+        # (observation index, 직전 action) 목록과 마지막 record_notes 위치 수집
+        observations: List[tuple] = []
+        last_notes_index = -1
+        last_action: Optional[ActionReasoningStep] = None
+
+        for i, step in enumerate(steps):
+            if isinstance(step, ActionReasoningStep):
+                last_action = step
+                if step.action == NOTES_TOOL:
+                    last_notes_index = i
+            elif isinstance(step, ObservationReasoningStep):
+                observations.append((i, last_action))
+                last_action = None
+
+        changed = False
+
+        # 1) record_notes 이전의 읽기 결과 → 노트로 대체되었으므로 압축
+        for i, action in observations:
+            if i < last_notes_index and self._compactable(steps[i], action):
+                steps[i] = self._compacted_step(steps[i], action, "findings already captured via record_notes")
+                changed = True
+
+        # 2) 토큰 상한 초과 시 오래된 관찰부터 압축
+        candidates = observations[: max(len(observations) - self.keep_recent_observations, 0)]
+        for i, action in candidates:
+            if _estimate_tokens(steps) <= self.history_token_ceiling:
+                break
+            if self._compactable(steps[i], action):
+                steps[i] = self._compacted_step(
+                    steps[i], action, "history token ceiling reached; repeat the same call if the full text is needed"
+                )
+                self._mark_refetchable(action)
+                changed = True
+
+        return changed
+
+    @staticmethod
+    def _mark_refetchable(action: ActionReasoningStep) -> None:
+        controller = ACTIVE_BUDGET.get()
+        if controller is not None:
+            controller.mark_compacted(action.action, action.action_input or {})
+
+    @staticmethod
+    def _compactable(step: BaseReasoningStep, action: Optional[ActionReasoningStep]) -> bool:
+        if step.observation.startswith(COMPACTED_PREFIX):
+            return False
+        return action is not None and action.action in COMPACTABLE_TOOLS
+
+    @staticmethod
+    def _compacted_step(
+        step: ObservationReasoningStep, action: Optional[ActionReasoningStep], reason: str
+    ) -> ObservationReasoningStep:
+        first_line = step.observation.strip().splitlines()[0] if step.observation.strip() else ""
+        if len(first_line) > 120:
+            first_line = first_line[:117] + "..."
+
+        summary = (
+            f"{COMPACTED_PREFIX} {_describe_action(action)} returned {len(step.observation)} chars "
+            f"({reason}). First line: {first_line}"
+        )
+        return ObservationReasoningStep(observation=summary, return_direct=step.return_direct)
@@ -1,26 +1,57 @@
 import os
 import yaml
-from llama_index.core.agent.workflow import ReActAgent
-from model import load_llm_model
+from agents.compacting_agent import CompactingReActAgent
+from model import load_llm_model, react_step_output
 from tools.mcp_tool_registry import get_mcp_tools
+from utils.budget import budgeted_tools
 
 
 agent_system_prompt_path = os.path.join(os.path.dirname(__file__), "../templates/agent_system_prompt.yaml")
 with open(agent_system_prompt_path, 'r', encoding='utf-8') as f:
     agent_system_prompt = yaml.safe_load(f)
 
-file_viewer_llm = load_llm_model(temperature=0.1, top_p=0.1, max_tokens=8192)
+file_viewer_llm = load_llm_model(
+    temperature=0.1,
+    top_p=0.1,
+    max_tokens=8192,
+    route="FileViewerAgent",
+    validator=react_step_output,
+)
 
 file_viewer_tools = get_mcp_tools(
-    ["get_directory_structure", "read_file", "read_file_chunk", "record_notes"]
+    [
+        "get_directory_structure",
+        "read_files",
+        "read_file",
+        "read_file_chunk",
+        "get_file_outline",
+        "record_file_summary",
+        "record_notes",
+    ]
 )
 
 
-file_viewer_agent = ReActAgent(
+file_viewer_agent = CompactingReActAgent(
     name="FileViewerAgent",
     description="Analyzes the project directory and source files to produce structured notes for README generation.",
-    tools=file_viewer_tools,
+    tools=budgeted_tools("FileViewerAgent", file_viewer_tools),
     system_prompt=agent_system_prompt["FileViewerAgent"],
     llm=file_viewer_llm,
     can_handoff_to=["WriteAgent"],
+    budget_handoff_to="WriteAgent",
+)
+
+
+# 분석 전용: 다중 언어 README 처럼 분석 1회 + 작성 N회일 때, 노트를 최종 답변으로 반환하고 종료
+file_analysis_agent = CompactingReActAgent(
+    name="FileViewerAgent",
+    description="Analyzes the project directory and source files and returns structured notes as its final answer.",
+    tools=budgeted_tools(
+        "FileViewerAgent",
+        file_viewer_tools,
+        handoff_hint="Stop reading and return your analysis notes as the final answer now.",
+    ),
+    system_prompt=agent_system_prompt["FileViewerAnalysis"],
+    llm=file_viewer_llm,
+    can_handoff_to=[],
 )
@@ -1,23 +1,30 @@
 import os
 import yaml
-from llama_index.core.agent.workflow import ReActAgent
-from model import load_llm_model
+from agents.compacting_agent import CompactingReActAgent
+from model import load_llm_model, react_step_output
 from tools.mcp_tool_registry import get_mcp_tools
+from utils.budget import budgeted_tools
 
 
 agent_system_prompt_path = os.path.join(os.path.dirname(__file__), "../templates/agent_system_prompt.yaml")
 with open(agent_system_prompt_path, "r", encoding="utf-8") as f:
     agent_system_prompt = yaml.safe_load(f)
 
-review_llm = load_llm_model(temperature=0.2, top_p=0.6, max_tokens=8192)
+review_llm = load_llm_model(
+    temperature=0.2,
+    top_p=0.6,
+    max_tokens=8192,
+    route="ReviewAgent",
+    validator=react_step_output,
+)
 
 review_tools = get_mcp_tools(["review_readme"])
 
 
-review_agent = ReActAgent(
+review_agent = CompactingReActAgent(
     name="ReviewAgent",
     description="Reviews the generated README against the project analysis notes and suggests corrections and improvements.",
-    tools=review_tools,
+    tools=budgeted_tools("ReviewAgent", review_tools),
     system_prompt=agent_system_prompt["ReviewAgent"],
     llm=review_llm,
     can_handoff_to=["WriteAgent"],
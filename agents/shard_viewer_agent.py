@@ -0,0 +1,74 @@
+import os
+from typing import Dict
+
+import yaml
+from agents.compacting_agent import CompactingReActAgent
+from model import load_llm_model, react_step_output
+from tools.mcp_tool_registry import get_mcp_tools
+from utils.budget import budgeted_tools
+
+
+agent_system_prompt_path = os.path.join(os.path.dirname(__file__), "../templates/agent_system_prompt.yaml")
+with open(agent_system_prompt_path, "r", encoding="utf-8") as f:
+    agent_system_prompt = yaml.safe_load(f)
+
+shard_viewer_llm = load_llm_model(
+    temperature=0.1,
+    top_p=0.1,
+    max_tokens=8192,
+    route="ShardViewerAgent",
+    validator=react_step_output,
+)
+
+shard_reduce_llm = load_llm_model(temperature=0.2, top_p=0.6, max_tokens=8192, route="reduce_shard_notes")
+
+shard_viewer_tools = get_mcp_tools(
+    [
+        "get_directory_structure",
+        "read_files",
+        "read_file",
+        "read_file_chunk",
+        "get_file_outline",
+        "record_file_summary",
+        "record_notes",
+    ]
+)
+
+
+shard_viewer_agent = CompactingReActAgent(
+    name="ShardViewerAgent",
+    description="Analyzes one shard (sub-project) of a large repository and returns structured notes for it.",
+    tools=budgeted_tools("ShardViewerAgent", shard_viewer_tools),
+    system_prompt=agent_system_prompt["ShardViewerAgent"],
+    llm=shard_viewer_llm,
+    can_handoff_to=[],
+)
+
+
+async def reduce_shard_notes(shard_notes: Dict[str, str], user_requirements: str = "") -> str:
+    """
+    Merge per-shard analysis notes into a single project-level overview for WriteAgent.
+    """
+    sections = "\n\n".join(f"### shard: {name}\n{notes}" for name, notes in shard_notes.items())
+
+    prompt = f"""
+다음은 하나의 대형 저장소(monorepo)를 여러 shard 로 나누어 각각 분석한 노트입니다:
+
+[SHARD NOTES]
+{sections}
+
+[USER REQUIREMENTS]
+{user_requirements or "없음"}
+
+위 노트들을 합쳐 README 작성에 사용할 **프로젝트 전체 개요 노트**를 작성하세요:
+- 저장소 전체의 목적과 구성 (각 shard 가 무엇을 담당하는지 표 형태로)
+- shard 간 관계와 데이터/호출 흐름
+- 공통 설치·빌드·실행 방법과 shard 별 차이점
+- 공통 설정, 환경 변수, 의존성
+- README 에 반드시 들어가야 할 핵심 항목
+
+노트에 없는 내용은 추측하지 말고, 불확실한 부분은 "(확인 필요)"로 표시하세요.
+    """
+
+    response = await shard_reduce_llm.acomplete(prompt)
+    return response.text
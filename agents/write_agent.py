@@ -1,8 +1,9 @@
 import os
 import yaml
-from llama_index.core.agent.workflow import ReActAgent
-from model import load_llm_model
+from agents.compacting_agent import CompactingReActAgent
+from model import load_llm_model, react_step_output
 from tools.mcp_tool_registry import get_mcp_tools
+from utils.budget import budgeted_tools
 
 
 agent_system_prompt_path = os.path.join(
@@ -17,15 +18,18 @@ write_llm = load_llm_model(
     temperature=0.3, 
     top_p=0.9,
     max_tokens=8192,
+    route="WriteAgent",
+    validator=react_step_output,
 )
 
 write_tools = get_mcp_tools(["write_readme"])
 
-write_agent = ReActAgent(
+write_agent = CompactingReActAgent(
     name="WriteAgent",
     description="Generates or updates the project README using internal analysis notes and external web information.",
-    tools=write_tools,
+    tools=budgeted_tools("WriteAgent", write_tools),
     system_prompt=agent_system_prompt["WriteAgent"],
     llm=write_llm,
     can_handoff_to=["ReviewAgent"],
+    budget_handoff_to="ReviewAgent",
 )
@@ -0,0 +1,252 @@
+"""
+Batch README generation over a shared work queue (multi-node).
+
+Enqueue projects once, then start one worker per node against the same queue
+(an SQLite file or a shared directory). Each worker claims a project under a
+lease, keeps the lease alive with heartbeats while it runs, and writes the
+README and run metrics back to the queue. Failed runs are retried with backoff
+and dead-lettered after --max-attempts.
+
+    python batch_worker.py --backend fs --queue /shared/readme_queue enqueue --path repo1 repo2
+    python batch_worker.py --backend fs --queue /shared/readme_queue work
+    python batch_worker.py --backend fs --queue /shared/readme_queue status
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import time
+from typing import Any, Dict, Optional
+
+from utils.job_queue import project_job_key
+from utils.logging_config import setup_logger
+from utils.readme_targets import ReadmeTarget, targets_from_languages
+from utils.work_queue import DEAD, WorkItem, WorkQueue, open_work_queue
+
+# main/model 은 work 경로에서만 import: 에이전트 로딩 시 MCP 도구/LLM 설정이 필요하므로
+# enqueue/status 만 수행하는 제어 노드에서는 불러오지 않음
+logger = setup_logger(name="readme_agent", log_dir="./logs")
+
+# 재시도 대기: retry_base * 2^(시도-1), 최대 MAX_RETRY_DELAY 초
+MAX_RETRY_DELAY = 1800.0
+
+
+def _tier_totals() -> Dict[str, float]:
+    from model import get_tier_stats
+
+    stats = get_tier_stats().values()
+    return {
+        "llm_calls": sum(s["calls"] for s in stats),
+        "llm_fallbacks": sum(s["fallbacks"] for s in stats),
+        "estimated_cost": sum(s["estimated_cost"] for s in stats),
+    }
+
+
+async def _run_item(item: WorkItem) -> Dict[str, Any]:
+    """README 생성 1회 실행 → {"result", "metrics"}"""
+    from main import generate_readme_for_project
+
+    params = item.params
+    event_counts: Dict[str, int] = {}
+
+    def _count_event(event: Dict[str, Any]) -> None:
+        event_counts[event["type"]] = event_counts.get(event["type"], 0) + 1
+
+    tiers_before = _tier_totals()
+    started = time.perf_counter()
+
+    targets = params.get("targets")
+    result = await generate_readme_for_project(
+        project_root=params["project_root"],
+        user_requirements=params.get("user_requirements"),
+        existing_readme_path=params.get("existing_readme_path", "README.md"),
+        max_retries=params.get("max_retries", 3),
+        on_event=_count_event,
+        targets=[ReadmeTarget(**t) for t in targets] if targets else None,
+    )
+
+    tiers_after = _tier_totals()
+    metrics = {
+        "duration_s": round(time.perf_counter() - started, 3),
+        "attempt": item.attempts,
+        "worker_id": item.lease_owner,
+        "events": event_counts,
+        **{name: round(tiers_after[name] - tiers_before[name], 6) for name in tiers_after},
+    }
+    return {"result": result, "metrics": metrics}
+
+
+async def _heartbeat(queue: WorkQueue, item: WorkItem, job: asyncio.Task, lease_seconds: float) -> None:
+    """lease 를 주기적으로 연장하고, lease 를 잃으면 작업을 취소 (중복 처리 방지)"""
+    interval = max(1.0, lease_seconds / 3)
+    while not job.done():
+        await asyncio.sleep(interval)
+        try:
+            alive = await asyncio.to_thread(queue.heartbeat, item, lease_seconds)
+        except Exception as e:
+            # 일시적인 저장소 오류는 다음 heartbeat 에서 재시도 (lease 는 아직 유효할 수 있음)
+            logger.warning(f"⚠️ heartbeat 실패 ({item.key[:12]}): {e}")
+            continue
+        if not alive:
+            logger.error(f"⛔ lease 상실 → 작업 중단: {item.params['project_root']}")
+            job.cancel()
+            return
+
+
+async def process_item(queue: WorkQueue, item: WorkItem, lease_seconds: float, retry_base: float) -> str:
+    """
+    Run one claimed item and report it. Returns the final queue status for the item
+    ("done", "queued", "dead" or "lease_lost").
+    """
+    from main import WORKFLOW_FAILED_MESSAGE, is_workflow_failed
+
+    project_root = item.params["project_root"]
+    logger.info(f"🏗️ [{item.lease_owner}] 작업 시작 ({item.attempts}/{queue.max_attempts}): {project_root}")
+
+    job = asyncio.create_task(_run_item(item))
+    heartbeat = asyncio.create_task(_heartbeat(queue, item, job, lease_seconds))
+
+    try:
+        outcome = await job
+        error = WORKFLOW_FAILED_MESSAGE.splitlines()[0] if is_workflow_failed(outcome["result"]) else None
+    except asyncio.CancelledError:
+        if heartbeat.done() and not heartbeat.cancelled():
+            return "lease_lost"
+        raise
+    except Exception as e:
+        outcome, error = None, f"{type(e).__name__}: {e}"
+    finally:
+        heartbeat.cancel()
+        await asyncio.gather(heartbeat, return_exceptions=True)
+
+    if error is None:
+        if await asyncio.to_thread(queue.complete, item, outcome["result"], outcome["metrics"]):
+            logger.info(f"✅ 작업 완료 ({outcome['metrics']['duration_s']}s): {project_root}")
+            return "done"
+        logger.error(f"⛔ 완료 보고 거부 (lease 상실): {project_root}")
+        return "lease_lost"
+
+    retry_delay = min(retry_base * 2 ** (item.attempts - 1), MAX_RETRY_DELAY)
+    status = await asyncio.to_thread(queue.fail, item, error, retry_delay)
+    if status is None:
+        logger.error(f"⛔ 실패 보고 거부 (lease 상실): {project_root}")
+        return "lease_lost"
+    logger.error(f"❌ 작업 실패 → {status}: {project_root} ({error})")
+    return status
+
+
+async def run_worker(
+    queue: WorkQueue,
+    worker_id: str,
+    lease_seconds: float = 900.0,
+    poll_interval: float = 10.0,
+    retry_base: float = 60.0,
+    max_jobs: Optional[int] = None,
+    exit_when_idle: bool = False,
+) -> Dict[str, int]:
+    """
+    Claim and process items until the queue is empty (exit_when_idle) or max_jobs
+    items were processed. One item runs at a time per worker process; start more
+    workers to process items in parallel.
+    """
+    # 작업을 claim 하기 전에 워크플로우를 로딩 (설정 오류로 lease 만 잡고 죽지 않도록)
+    import main  # noqa: F401
+
+    processed: Dict[str, int] = {}
+
+    while max_jobs is None or sum(processed.values()) < max_jobs:
+        item = await asyncio.to_thread(queue.claim, worker_id, lease_seconds)
+        if item is None:
+            if exit_when_idle:
+                break
+            await asyncio.sleep(poll_interval)
+            continue
+
+        status = await process_item(queue, item, lease_seconds, retry_base)
+        processed[status] = processed.get(status, 0) + 1
+
+    logger.info(f"🏁 [{worker_id}] 워커 종료: {processed}")
+    return processed
+
+
+# -------------------------------------------------------------------
+def _enqueue(queue: WorkQueue, args: argparse.Namespace) -> None:
+    targets = targets_from_languages(args.languages) if args.languages else None
+    target_dicts = [vars(t) for t in targets] if targets else None
+
+    for path in args.path:
+        params = {
+            "project_root": os.path.abspath(path),
+            "user_requirements": args.requirements,
+            "existing_readme_path": "README.md",
+            "max_retries": 3,
+            "targets": target_dicts,
+        }
+        key = project_job_key(
+            params["project_root"], params["user_requirements"], params["existing_readme_path"], target_dicts
+        )
+        item_id, deduplicated = queue.enqueue(key, params, priority=args.priority)
+        print(f"{'dedup' if deduplicated else 'queued'} {item_id} {params['project_root']}")
+
+
+def _status(queue: WorkQueue) -> None:
+    report = {
+        "stats": queue.stats(),
+        "dead": [
+            {"project_root": item.params["project_root"], "attempts": item.attempts, "error": item.error}
+            for item in queue.items(DEAD)
+        ],
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ReadmeAgent 멀티 노드 배치 워커")
+    parser.add_argument("--backend", default="sqlite", choices=["sqlite", "fs"], help="작업 큐 백엔드")
+    parser.add_argument(
+        "--queue",
+        default="./logs/work_queue.db",
+        help="sqlite: 데이터베이스 파일, fs: 모든 노드가 공유하는 디렉토리",
+    )
+    parser.add_argument("--max-attempts", default=3, type=int, help="이 횟수만큼 실패하면 dead-letter 로 이동")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_parser = sub.add_parser("enqueue", help="프로젝트를 작업 큐에 추가")
+    enqueue_parser.add_argument("--path", nargs="+", required=True, help="README를 작성할 프로젝트 경로들")
+    enqueue_parser.add_argument("--languages", nargs="+", default=None)
+    enqueue_parser.add_argument(
+        "--requirements",
+        default="README는 한국어로 작성하고, 설치/실행 예제를 꼭 포함해주세요.",
+    )
+    enqueue_parser.add_argument("--priority", default=0, type=int, help="작을수록 먼저 처리")
+
+    work_parser = sub.add_parser("work", help="작업 큐를 처리하는 워커 실행 (노드마다 하나)")
+    work_parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    work_parser.add_argument("--lease-seconds", default=900.0, type=float)
+    work_parser.add_argument("--poll-interval", default=10.0, type=float)
+    work_parser.add_argument("--retry-base", default=60.0, type=float, help="첫 재시도 대기 시간 (초, 이후 2배씩)")
+    work_parser.add_argument("--max-jobs", default=None, type=int)
+    work_parser.add_argument("--exit-when-idle", action="store_true", help="큐가 비면 종료")
+
+    sub.add_parser("status", help="상태별 작업 수와 dead-letter 목록 출력")
+
+    batch_args = parser.parse_args()
+    work_queue = open_work_queue(batch_args.backend, batch_args.queue, max_attempts=batch_args.max_attempts)
+
+    if batch_args.command == "enqueue":
+        _enqueue(work_queue, batch_args)
+    elif batch_args.command == "status":
+        _status(work_queue)
+    else:
+        asyncio.run(
+            run_worker(
+                work_queue,
+                worker_id=batch_args.worker_id,
+                lease_seconds=batch_args.lease_seconds,
+                poll_interval=batch_args.poll_interval,
+                retry_base=batch_args.retry_base,
+                max_jobs=batch_args.max_jobs,
+                exit_when_idle=batch_args.exit_when_idle,
+            )
+        )
@@ -2,5 +2,27 @@ import argparse
 
 parser = argparse.ArgumentParser()
 parser.add_argument("--path", required=True, type=str, help="README를 작성할 프로젝트 경로")
+parser.add_argument(
+    "--stream",
+    action="store_true",
+    help="README 토큰과 진행 이벤트를 생성되는 즉시 stdout으로 출력",
+)
+parser.add_argument(
+    "--languages",
+    nargs="+",
+    default=None,
+    help="여러 언어 README를 한 번의 분석으로 생성 (예: --languages ko en ja → README.md, README.en.md, README.ja.md)",
+)
+parser.add_argument(
+    "--profile",
+    nargs="?",
+    const="spans",
+    default=None,
+    choices=["spans", "cprofile", "pyinstrument"],
+    help=(
+        "에이전트/도구/LLM 구간 시간, 도구별 메모리 peak, 이벤트 루프 지연을 측정해 logs/profile_*.json 과 "
+        "flamegraph 용 .collapsed 파일로 저장 (cprofile/pyinstrument 지정 시 전체 샘플링도 함께 저장)"
+    ),
+)
 
 args = parser.parse_args()
\ No newline at end of file
@@ -1,5 +1,5 @@
 import os
-from typing import Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Union
 import asyncio
 import traceback
 
@@ -7,11 +7,17 @@ from llama_index.core.agent.workflow import AgentWorkflow
 from llama_index.core.workflow import Context
 from workflows.errors import WorkflowRuntimeError
 
-from agents.file_viewer_agent import file_viewer_agent
+from agents.file_viewer_agent import file_analysis_agent, file_viewer_agent
 from agents.write_agent import write_agent
 from agents.review_agent import review_agent
+from agents.shard_viewer_agent import reduce_shard_notes, shard_viewer_agent
+from model import get_tier_stats
+from utils.budget import ACTIVE_BUDGET, BudgetController
 from utils.logging_config import setup_logger
-from utils.mcp_runtime import write_runtime_config
+from utils.mcp_runtime import ACTIVE_PROJECT_ROOT, write_runtime_config
+from utils.profiling import ACTIVE_PROFILER, profile_run, profile_scope
+from utils.readme_targets import ReadmeTarget, targets_from_languages
+from utils.sharding import Shard, detect_shards
 
 from llama_index.core.agent.workflow import (
     AgentInput,
@@ -34,21 +40,89 @@ readme_workflow = AgentWorkflow(
     },
 )
 
+# 분석 1회 + 작성 N회 (일반 프로젝트): FileViewerAgent 가 노트를 최종 답변으로 반환
+analysis_workflow = AgentWorkflow(
+    agents=[file_analysis_agent],
+    root_agent="FileViewerAgent",
+    initial_state={
+        "project_root": None,
+        "user_requirements": "",
+    },
+)
+
+# monorepo map 단계: shard 하나를 독립적으로 분석
+shard_workflow = AgentWorkflow(
+    agents=[shard_viewer_agent],
+    root_agent="ShardViewerAgent",
+    initial_state={
+        "project_root": None,
+        "user_requirements": "",
+    },
+)
+
+# monorepo reduce 이후: 합쳐진 노트로 작성/검수만 수행
+write_workflow = AgentWorkflow(
+    agents=[write_agent, review_agent],
+    root_agent="WriteAgent",
+    initial_state={
+        "project_root": None,
+        "user_requirements": "",
+    },
+)
+
+
+# 스트리밍 이벤트 콜백 타입: dict 이벤트를 받아 동기/비동기로 처리
+EventCallback = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+async def _emit(on_event: Optional[EventCallback], event: Dict[str, Any]) -> None:
+    """콜백이 등록되어 있으면 이벤트를 전달 (동기/비동기 콜백 모두 지원)"""
+    if on_event is None:
+        return
+
+    try:
+        maybe_awaitable = on_event(event)
+        if asyncio.iscoroutine(maybe_awaitable) or isinstance(maybe_awaitable, asyncio.Future):
+            await maybe_awaitable
+    except Exception as e:
+        # 콜백 오류가 워크플로우 자체를 망가뜨리지 않도록 로그만 남김
+        logger.warning(f"⚠️ 스트리밍 콜백 처리 중 오류: {e}")
+
+
+def _tagged(on_event: Optional[EventCallback], **tags: str) -> Optional[EventCallback]:
+    """하위 단계(shard/target)에서 발생한 이벤트에 tags 를 붙여 전달"""
+    if on_event is None:
+        return None
+
+    async def _callback(event: Dict[str, Any]) -> None:
+        await _emit(on_event, {**event, **tags})
+
+    return _callback
+
 
 # -------------------------------------------------------------------
 # 🔥 안전하게 워크플로우 실행하는 모듈형 함수
 # -------------------------------------------------------------------
-async def _run_workflow_single_attempt(ctx: Context, user_msg: str) -> str:
+async def _run_workflow_single_attempt(
+    ctx: Context,
+    user_msg: str,
+    on_event: Optional[EventCallback] = None,
+    max_iterations: int = 50,
+    workflow: Optional[AgentWorkflow] = None,
+) -> str:
     """단일 워크플로우 실행 (한 번의 attempt)
        실패 시 예외를 던짐 (상위에서 retry 처리)
+       on_event 가 주어지면 토큰/진행 이벤트를 생성되는 즉시 전달
+       workflow 를 지정하지 않으면 readme_workflow 사용
     """
-    handler = readme_workflow.run(
+    handler = (workflow or readme_workflow).run(
         user_msg=user_msg,
         ctx=ctx,
-        max_iterations=50,
+        max_iterations=max_iterations,
     )
 
     current_agent = None
+    profiler = ACTIVE_PROFILER.get()
 
     async for event in handler.stream_events():
         # Agent change log
@@ -56,9 +130,32 @@ async def _run_workflow_single_attempt(ctx: Context, user_msg: str) -> str:
             if event.current_agent_name != current_agent:
                 current_agent = event.current_agent_name
                 logger.info(f"\n========== AGENT: {current_agent} ==========\n")
+                if profiler is not None:
+                    profiler.agent_switched(current_agent)
+                await _emit(on_event, {"type": "agent", "agent": current_agent})
+
+        # AgentStream: LLM 토큰 단위 출력
+        if isinstance(event, AgentStream):
+            if event.delta:
+                await _emit(
+                    on_event,
+                    {"type": "token", "agent": event.current_agent_name, "delta": event.delta},
+                )
+
+        # ToolCall: 도구 호출 시작
+        elif isinstance(event, ToolCall) and not isinstance(event, ToolCallResult):
+            await _emit(
+                on_event,
+                {
+                    "type": "tool_call",
+                    "agent": current_agent,
+                    "tool_name": event.tool_name,
+                    "tool_kwargs": event.tool_kwargs,
+                },
+            )
 
         # AgentOutput
-        if isinstance(event, AgentOutput):
+        elif isinstance(event, AgentOutput):
             if event.response and event.response.content:
                 logger.info(f"📤 Output: {event.response.content}")
             else:
@@ -69,8 +166,19 @@ async def _run_workflow_single_attempt(ctx: Context, user_msg: str) -> str:
             logger.info(f"🔧 Tool Result ({event.tool_name})")
             logger.info(f"Args: {event.tool_kwargs}")
             logger.info(f"Output: {str(event.tool_output)[:800]}")
+            await _emit(
+                on_event,
+                {
+                    "type": "tool_result",
+                    "agent": current_agent,
+                    "tool_name": event.tool_name,
+                    "output_preview": str(event.tool_output)[:800],
+                },
+            )
 
     final_response = await handler
+    if profiler is not None:
+        profiler.agent_finished()
 
     # final_response 검증
     if (
@@ -84,44 +192,250 @@ async def _run_workflow_single_attempt(ctx: Context, user_msg: str) -> str:
 
 
 # -------------------------------------------------------------------
-# 🔥 Retry logic 적용된 최종 호출 함수
+# 🔥 Monorepo map-reduce 분석
 # -------------------------------------------------------------------
-async def generate_readme_for_project(
-    project_root: str,
-    user_requirements: Optional[str] = None,
-    existing_readme_path: str = "README.md",
-    max_retries: int = 3,  # 🔥 실패하면 자동 재시도 횟수
+async def _run_analysis(
+    workflow: AgentWorkflow,
+    run_state: Dict[str, Any],
+    user_msg: str,
+    label: str,
+    budget_root: str,
+    exclude: Optional[List[str]] = None,
+    on_event: Optional[EventCallback] = None,
+    max_retries: int = 2,
+) -> Optional[str]:
+    """분석 전용 워크플로우를 재시도하며 실행하고 노트(최종 답변)를 반환, 모든 시도가 실패하면 None"""
+    for attempt in range(1, max_retries + 1):
+        ctx = Context(workflow)
+        await ctx.store.set("state", run_state)
+
+        # 분석 대상 크기에 맞춘 예산 (동시에 도는 다른 분석과 분리됨, exclude 된 하위 shard 는 제외)
+        budget = BudgetController.for_project(budget_root, exclude=exclude)
+        budget_token = ACTIVE_BUDGET.set(budget)
+        root_token = ACTIVE_PROJECT_ROOT.set(run_state["project_root"])
+
+        try:
+            notes = await _run_workflow_single_attempt(
+                ctx,
+                user_msg,
+                on_event=on_event,
+                max_iterations=budget.max_iterations,
+                workflow=workflow,
+            )
+            logger.info(f"🧩 {label} 분석 완료 ({attempt}/{max_retries})")
+            return notes
+
+        except Exception as e:
+            logger.error(f"❌ {label} 분석 실패 ({attempt}/{max_retries}): {e}")
+            logger.error(traceback.format_exc())
+
+        finally:
+            ACTIVE_PROJECT_ROOT.reset(root_token)
+            ACTIVE_BUDGET.reset(budget_token)
+
+    return None
+
+
+async def _analyze_project(
+    state: Dict[str, Any],
+    on_event: Optional[EventCallback] = None,
+) -> Optional[str]:
+    """일반 프로젝트를 분석 전용 FileViewerAgent 로 한 번 분석하고 노트를 반환, 실패하면 None"""
+    analysis_msg = (
+        "다음 프로젝트 디렉토리를 분석하고, README 작성에 사용할 분석 노트를 최종 답변으로 반환해줘.\n\n"
+        f"- project_root: {state['project_root']}\n"
+        f"- user_requirements: {state['user_requirements'] or '없음'}"
+    )
+    with profile_scope("analysis"):
+        return await _run_analysis(
+            analysis_workflow,
+            state,
+            analysis_msg,
+            label="Project",
+            budget_root=state["project_root"],
+            on_event=on_event,
+        )
+
+
+async def _analyze_shard(
+    shard: Shard,
+    state: Dict[str, Any],
+    semaphore: asyncio.Semaphore,
+    on_event: Optional[EventCallback] = None,
+    max_retries: int = 2,
+) -> Optional[str]:
+    """shard 하나를 ShardViewerAgent 로 분석하고 노트(최종 답변)를 반환, 모든 시도가 실패하면 None"""
+    exclude_line = (
+        f"- exclude: {shard.exclude} (get_directory_structure 호출 시 exclude 인자로 그대로 전달)\n"
+        if shard.exclude
+        else "- exclude: 없음\n"
+    )
+    shard_msg = (
+        "다음 shard 만 분석하고, 분석 노트를 최종 답변으로 반환해줘.\n\n"
+        f"- shard_name: {shard.name}\n"
+        f"- shard_root: {shard.path}\n"
+        f"{exclude_line}"
+        f"- project_root (전체 저장소): {state['project_root']}\n"
+        f"- user_requirements: {state['user_requirements'] or '없음'}"
+    )
+
+    async with semaphore:
+        with profile_scope(f"shard:{shard.name}"):
+            await _emit(on_event, {"type": "shard", "shard": shard.name, "status": "started"})
+            notes = await _run_analysis(
+                shard_workflow,
+                {**state, "shard_root": shard.path},
+                shard_msg,
+                label=f"Shard '{shard.name}'",
+                budget_root=shard.path,
+                exclude=shard.exclude,
+                on_event=_tagged(on_event, shard=shard.name),
+                max_retries=max_retries,
+            )
+
+    await _emit(on_event, {"type": "shard", "shard": shard.name, "status": "done" if notes is not None else "failed"})
+    return notes
+
+
+async def _analyze_monorepo(
+    state: Dict[str, Any],
+    shards: List[Shard],
+    on_event: Optional[EventCallback] = None,
+    max_parallel_shards: int = 4,
+) -> Optional[Dict[str, str]]:
+    """
+    shard 들을 동시에 분석(map)한 뒤 하나의 project_overview 로 합침(reduce)
+    모든 shard 분석이 실패하면 None
+    """
+    logger.info(f"🗂️ Monorepo 감지: {len(shards)}개 shard 병렬 분석 → {[s.name for s in shards]}")
+    semaphore = asyncio.Semaphore(max_parallel_shards)
+
+    analyzed = await asyncio.gather(
+        *(_analyze_shard(shard, state, semaphore, on_event=on_event) for shard in shards)
+    )
+    if all(result is None for result in analyzed):
+        logger.error("❌ 모든 shard 분석 실패 → README 작성 중단")
+        return None
+
+    # 일부 shard 만 실패한 경우: 실패 사실을 노트에 남기고 나머지로 진행
+    results = [
+        result if result is not None else f"(shard '{shard.name}' 분석 실패 — 경로: {shard.path})"
+        for shard, result in zip(shards, analyzed)
+    ]
+    notes = {f"shard:{shard.name}": result for shard, result in zip(shards, results)}
+
+    await _emit(on_event, {"type": "reduce", "shards": len(shards)})
+    with profile_scope("reduce_shard_notes"):
+        notes["project_overview"] = await _reduce_with_fallback(
+            {shard.name: result for shard, result in zip(shards, results)},
+            user_requirements=state["user_requirements"],
+        )
+    return notes
+
+
+async def _reduce_with_fallback(
+    shard_notes: Dict[str, str],
+    user_requirements: str,
+    max_retries: int = 2,
 ) -> str:
+    """
+    shard 노트를 reduce_shard_notes 로 합침 (재시도 포함)
+    끝까지 실패하거나 빈 응답이면 shard 노트를 그대로 이어 붙여 반환 (예외를 던지지 않음)
+    """
+    for attempt in range(1, max_retries + 1):
+        try:
+            overview = await reduce_shard_notes(shard_notes, user_requirements=user_requirements)
+        except Exception as e:
+            logger.error(f"❌ shard 노트 reduce 실패 ({attempt}/{max_retries}): {e}")
+            logger.error(traceback.format_exc())
+            continue
 
-    state = {
-        "project_root": os.path.abspath(project_root),
-        "user_requirements": user_requirements or "",
-        "existing_readme_path": os.path.abspath(existing_readme_path),
-    }
+        if overview and overview.strip():
+            return overview
+        logger.warning(f"⚠️ shard 노트 reduce 결과가 비어 있음 ({attempt}/{max_retries})")
+
+    # 이미 끝난 shard 분석을 버리지 않도록 원본 노트로 대체
+    logger.warning("⚠️ reduce 실패 → shard 노트를 이어 붙여 project_overview 로 사용")
+    return "\n\n".join(f"### shard: {name}\n{notes}" for name, notes in shard_notes.items())
+
+
+# -------------------------------------------------------------------
+# 🔥 README 출력 대상 (utils.readme_targets.ReadmeTarget) — 분석 1회 + 작성 N회
+# -------------------------------------------------------------------
+def _write_stage_message(state: Dict[str, Any], target: Optional[ReadmeTarget] = None) -> str:
+    """분석이 끝난 뒤 WriteAgent → ReviewAgent 단계에 넘길 프롬프트"""
+    output_line = ""
+    if target is not None:
+        output_line = (
+            f"- output_language: {target.language}\n"
+            f"- output_path: {target.path} (write_readme 호출 시 relative_path 로 사용)\n"
+        )
 
-    # root 프롬프트
-    base_user_msg = (
-        "다음 프로젝트 디렉토리에 대해 README를 새로 작성하고, "
+    return (
+        "다음 프로젝트에 대해 README를 새로 작성하고, "
         "최종적으로 검수까지 완료해줘.\n\n"
         f"- project_root: {state['project_root']}\n"
         f"- existing_readme_path: {state['existing_readme_path']}\n"
+        f"{output_line}"
         f"- user_requirements: {state['user_requirements'] or '없음'}\n\n"
-        "FileViewerAgent → WriteAgent → ReviewAgent 순서로, "
+        "프로젝트 분석은 이미 완료되었습니다. 아래 project_overview 노트를 근거로 작성하고, "
+        "세부 내용은 state 의 file_viewer_notes 를 참고해줘.\n\n"
+        f"[project_overview]\n{state['file_viewer_notes']['project_overview']}\n\n"
+        "WriteAgent → ReviewAgent 순서로, "
         "필요한 만큼 handoff를 수행해서 최종 완성도 높은 README를 만들어줘."
     )
 
-    
-    
-    # 재시도 루프
+
+# 모든 재시도가 실패했을 때 반환되는 메시지 (배치 워커가 실패 여부 판단에 사용)
+WORKFLOW_FAILED_MESSAGE = (
+    "워크플로우가 여러 번 실패하여 README 생성에 실패했습니다.\n"
+    "하지만 에이전트가 가능한 모든 재시도를 수행했습니다.\n"
+    "입력 데이터 또는 모델 설정을 점검해 주세요."
+)
+
+
+def is_workflow_failed(result: Union[str, Dict[str, str]]) -> bool:
+    """generate_readme_for_project 결과 중 하나라도 실패 메시지이면 True"""
+    if isinstance(result, dict):
+        return any(content == WORKFLOW_FAILED_MESSAGE for content in result.values())
+    return result == WORKFLOW_FAILED_MESSAGE
+
+
+async def _run_with_retries(
+    state: Dict[str, Any],
+    workflow: AgentWorkflow,
+    user_msg: str,
+    max_retries: int,
+    on_event: Optional[EventCallback] = None,
+) -> str:
+    """워크플로우를 attempt 단위로 재시도하며 실행"""
     for attempt in range(1, max_retries + 1):
         logger.info(f"\n\n🚀 [ATTEMPT {attempt}/{max_retries}] 워크플로우 실행 시작\n")
+        # 재시도 시 소비자가 이전 attempt 의 부분 출력을 버릴 수 있도록 알림
+        await _emit(on_event, {"type": "attempt", "attempt": attempt, "max_retries": max_retries})
 
-        ctx = Context(readme_workflow)
+        ctx = Context(workflow)
         await ctx.store.set("state", state)
         write_runtime_config(project_root=state["project_root"])
 
+        # 프로젝트 크기에 맞춘 에이전트별 예산 (attempt 마다 새로 시작)
+        budget = BudgetController.for_project(state["project_root"])
+        budget_token = ACTIVE_BUDGET.set(budget)
+        # MCP 도구(write_readme 등)에 이 실행의 project_root 를 명시적으로 전달 (동시 작업 간 분리)
+        root_token = ACTIVE_PROJECT_ROOT.set(state["project_root"])
+        logger.info(
+            f"📏 Budget tier={budget.tier} files={budget.file_count} "
+            f"max_iterations={budget.max_iterations}"
+        )
+
         try:
-            result = await _run_workflow_single_attempt(ctx, base_user_msg)
+            result = await _run_workflow_single_attempt(
+                ctx,
+                user_msg,
+                on_event=on_event,
+                max_iterations=budget.max_iterations,
+                workflow=workflow,
+            )
             logger.info("🎉 워크플로우 성공적으로 완료!")
             return result
 
@@ -144,24 +458,232 @@ async def generate_readme_for_project(
             logger.error(traceback.format_exc())
             continue
 
+        finally:
+            ACTIVE_PROJECT_ROOT.reset(root_token)
+            ACTIVE_BUDGET.reset(budget_token)
+            logger.info(f"📊 Budget usage: {budget.summary()}")
+            logger.info(f"💰 Model tier stats: {get_tier_stats()}")
+
     # 🔥 모든 재시도 실패 시 최종 메시지 반환
-    return (
-        "워크플로우가 여러 번 실패하여 README 생성에 실패했습니다.\n"
-        "하지만 에이전트가 가능한 모든 재시도를 수행했습니다.\n"
-        "입력 데이터 또는 모델 설정을 점검해 주세요."
+    return WORKFLOW_FAILED_MESSAGE
+
+
+async def _write_target(
+    state: Dict[str, Any],
+    target: ReadmeTarget,
+    max_retries: int,
+    on_event: Optional[EventCallback] = None,
+) -> str:
+    """공유 분석 노트로 대상(언어/경로) 하나의 README 작성 + 검수"""
+    requirements = target.requirements or state["user_requirements"]
+    target_state = {
+        **state,
+        "user_requirements": f"README 언어: {target.language}. {requirements}".strip(),
+        "existing_readme_path": os.path.join(state["project_root"], target.path),
+        "output_path": target.path,
+    }
+
+    with profile_scope(f"target:{target.path}"):
+        return await _run_with_retries(
+            target_state,
+            write_workflow,
+            _write_stage_message(target_state, target),
+            max_retries=max_retries,
+            on_event=_tagged(on_event, target=target.path),
+        )
+
+
+# -------------------------------------------------------------------
+# 🔥 Retry logic 적용된 최종 호출 함수
+# -------------------------------------------------------------------
+async def generate_readme_for_project(
+    project_root: str,
+    user_requirements: Optional[str] = None,
+    existing_readme_path: str = "README.md",
+    max_retries: int = 3,  # 🔥 실패하면 자동 재시도 횟수
+    on_event: Optional[EventCallback] = None,  # 🔥 토큰/진행 이벤트 콜백
+    enable_sharding: bool = True,  # 🔥 monorepo 면 shard 별 병렬 분석
+    shard_min_files: int = 400,  # 이 파일 수를 넘는 최상위 디렉토리는 별도 shard
+    max_parallel_shards: int = 4,
+    targets: Optional[List[ReadmeTarget]] = None,  # 🔥 여러 언어/경로 README 동시 생성
+) -> Union[str, Dict[str, str]]:
+    """
+    targets 가 없으면 최종 README 문자열을, 있으면 {target.path: 결과} 를 반환
+    """
+
+    state = {
+        "project_root": os.path.abspath(project_root),
+        "user_requirements": user_requirements or "",
+        "existing_readme_path": os.path.abspath(existing_readme_path),
+    }
+
+    shards = detect_shards(state["project_root"], min_files_per_dir=shard_min_files) if enable_sharding else []
+
+    # 단일 README + 일반 프로젝트: FileViewerAgent → WriteAgent → ReviewAgent 전체 워크플로우
+    if not shards and not targets:
+        base_user_msg = (
+            "다음 프로젝트 디렉토리에 대해 README를 새로 작성하고, "
+            "최종적으로 검수까지 완료해줘.\n\n"
+            f"- project_root: {state['project_root']}\n"
+            f"- existing_readme_path: {state['existing_readme_path']}\n"
+            f"- user_requirements: {state['user_requirements'] or '없음'}\n\n"
+            "FileViewerAgent → WriteAgent → ReviewAgent 순서로, "
+            "필요한 만큼 handoff를 수행해서 최종 완성도 높은 README를 만들어줘."
+        )
+        return await _run_with_retries(state, readme_workflow, base_user_msg, max_retries, on_event=on_event)
+
+    # 분석은 한 번만 수행 (monorepo 는 shard 병렬, 그 외에는 분석 전용 FileViewerAgent)
+    write_runtime_config(project_root=state["project_root"])
+    if shards:
+        notes = await _analyze_monorepo(
+            state, shards, on_event=on_event, max_parallel_shards=max_parallel_shards
+        )
+    else:
+        overview = await _analyze_project(state, on_event=on_event)
+        notes = {"project_overview": overview} if overview is not None else None
+
+    # 분석 실패 시 빈 노트로 README 를 쓰지 않고 실패로 종료
+    if notes is None:
+        if targets:
+            return {target.path: WORKFLOW_FAILED_MESSAGE for target in targets}
+        return WORKFLOW_FAILED_MESSAGE
+    state["file_viewer_notes"] = notes
+
+    # 재시도는 작성/검수 단계만
+    if not targets:
+        return await _run_with_retries(
+            state, write_workflow, _write_stage_message(state), max_retries, on_event=on_event
+        )
+
+    # 대상별 WriteAgent/ReviewAgent 를 동시에 실행 (같은 노트 공유)
+    logger.info(f"🌐 README {len(targets)}종 동시 작성: {[t.path for t in targets]}")
+    results = await asyncio.gather(
+        *(_write_target(state, target, max_retries, on_event=on_event) for target in targets)
     )
+    return {target.path: result for target, result in zip(targets, results)}
+
 
 
 # -------------------------------------------------------------------
-async def main():
-    from cli import args
+# 🔥 스트리밍 API: 토큰/진행 이벤트를 생성되는 즉시 yield
+# -------------------------------------------------------------------
+async def stream_readme_for_project(
+    project_root: str,
+    user_requirements: Optional[str] = None,
+    existing_readme_path: str = "README.md",
+    max_retries: int = 3,
+    targets: Optional[List[ReadmeTarget]] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """generate_readme_for_project 의 async generator 버전
+
+    이벤트 종류:
+      - {"type": "attempt", "attempt", "max_retries"}
+      - {"type": "agent", "agent"}
+      - {"type": "token", "agent", "delta"}
+      - {"type": "tool_call", "agent", "tool_name", "tool_kwargs"}
+      - {"type": "tool_result", "agent", "tool_name", "output_preview"}
+      - {"type": "shard", "shard", "status"} / {"type": "reduce", "shards"}  (분석 단계)
+      - {"type": "result", "content"}  (항상 마지막 이벤트, targets 가 있으면 content 는 dict)
+    shard/target 단계의 이벤트에는 "shard" 또는 "target" 키가 추가됨
+    """
+    queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+
+    task = asyncio.create_task(
+        generate_readme_for_project(
+            project_root=project_root,
+            user_requirements=user_requirements,
+            existing_readme_path=existing_readme_path,
+            max_retries=max_retries,
+            on_event=queue.put_nowait,
+            targets=targets,
+        )
+    )
+
+    try:
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+
+            if getter in done:
+                yield getter.result()
+                continue
+
+            getter.cancel()
+            break
+
+        # 워크플로우 종료 후 큐에 남은 이벤트 모두 방출
+        while not queue.empty():
+            yield queue.get_nowait()
+
+        yield {"type": "result", "content": task.result()}
+
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def _print_result(result: Union[str, Dict[str, str]]) -> None:
+    if isinstance(result, dict):
+        for path, content in result.items():
+            print(f"=== Workflow Result: {path} ===")
+            print(content)
+    else:
+        print("=== Workflow Result ===")
+        print(result)
+
+
+async def _run_cli(args) -> None:
+    user_requirements = "README는 한국어로 작성하고, 설치/실행 예제를 꼭 포함해주세요."
+    targets = targets_from_languages(args.languages) if args.languages else None
+
+    if args.stream:
+        # 토큰이 생성되는 즉시 stdout 으로 출력
+        async for event in stream_readme_for_project(
+            project_root=args.path,
+            user_requirements=user_requirements,
+            max_retries=3,
+            targets=targets,
+        ):
+            if event["type"] == "token":
+                print(event["delta"], end="", flush=True)
+            elif event["type"] == "agent":
+                scope = event.get("target") or event.get("shard")
+                print(f"\n\n===== {event['agent']}{f' [{scope}]' if scope else ''} =====", flush=True)
+            elif event["type"] == "tool_call":
+                print(f"\n[tool] {event['tool_name']}", flush=True)
+            elif event["type"] == "attempt" and event["attempt"] > 1:
+                print(f"\n\n[retry {event['attempt']}/{event['max_retries']}]", flush=True)
+            elif event["type"] == "result":
+                print("\n")
+                _print_result(event["content"])
+        return
+
     result = await generate_readme_for_project(
         project_root=args.path,
-        user_requirements="README는 한국어로 작성하고, 설치/실행 예제를 꼭 포함해주세요.",
+        user_requirements=user_requirements,
         max_retries=3,
+        targets=targets,
     )
-    print("=== Workflow Result ===")
-    print(result)
+    _print_result(result)
+
+
+async def main():
+    from cli import args
+
+    if not args.profile:
+        await _run_cli(args)
+        return
+
+    # 🔥 --profile: agent/tool/llm span, 할당, 이벤트 루프 지연을 logs/ 에 리포트로 저장
+    # 리포트는 profiler 가 멈춘 뒤(wall time·열린 span 확정 후)에 기록
+    profiler = None
+    try:
+        async with profile_run(mode=args.profile, log_dir="./logs") as profiler:
+            await _run_cli(args)
+    finally:
+        if profiler is not None:
+            report_paths = profiler.write_report(extra={"tier_stats": get_tier_stats()})
+            logger.info(f"⏱️ Profile report: {report_paths}")
 
 
 if __name__ == "__main__":
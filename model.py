@@ -1,15 +1,295 @@
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import configs
 from configs import LLM_API_CONFIGS
 from langchain_openai import ChatOpenAI
+from llama_index.core.base.llms.types import (
+    ChatMessage,
+    ChatResponse,
+    ChatResponseAsyncGen,
+    ChatResponseGen,
+    CompletionResponse,
+    CompletionResponseAsyncGen,
+    CompletionResponseGen,
+    LLMMetadata,
+)
+from llama_index.core.llms import LLM
 from llama_index.llms.langchain import LangChainLLM
+from pydantic import PrivateAttr
+from utils.budget import CHARS_PER_TOKEN
+from utils.profiling import record_llm_call
+
+# -------------------------------------------------------------------
+# 🔥 모델 티어 / 라우팅 설정 (한 곳에서 관리)
+# -------------------------------------------------------------------
+# 티어 이름 → ChatOpenAI kwargs (base_url, api_key, model ...)
+# configs.py 에 LLM_TIER_CONFIGS 가 없으면 기존 LLM_API_CONFIGS 하나만 "strong" 으로 사용
+LLM_TIER_CONFIGS: Dict[str, Dict[str, Any]] = getattr(
+    configs, "LLM_TIER_CONFIGS", {"strong": LLM_API_CONFIGS}
+)
+
+# 티어 이름 → 1K 토큰당 비용 {"input": float, "output": float} (선택)
+LLM_TIER_COSTS: Dict[str, Dict[str, float]] = getattr(configs, "LLM_TIER_COSTS", {})
+
+# 에이전트/도구 이름 → 티어
+MODEL_ROUTES: Dict[str, str] = {
+    "FileViewerAgent": "fast",
+    "ShardViewerAgent": "fast",
+    "WriteAgent": "strong",
+    "ReviewAgent": "strong",
+    "review_readme": "strong",
+    "reduce_shard_notes": "strong",
+}
+
+# 출력 검증 실패 시 올려 보낼 티어
+FALLBACK_TIERS: Dict[str, str] = {
+    "fast": "strong",
+}
+
+DEFAULT_TIER = "strong"
+
+
+@dataclass
+class TierStats:
+    calls: int = 0
+    failures: int = 0
+    fallbacks: int = 0
+    total_latency_s: float = 0.0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    estimated_cost: float = 0.0
+
+
+_TIER_STATS: Dict[str, TierStats] = {}
+
+
+def get_tier_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Per-tier call counts, validation failures, fallbacks, latency and estimated cost.
+    """
+    return {tier: asdict(stats) for tier, stats in _TIER_STATS.items()}
+
+
+def _record_call(tier: str, latency_s: float, prompt_chars: int, completion_chars: int, ok: bool) -> None:
+    record_llm_call(tier, latency_s)
+
+    stats = _TIER_STATS.setdefault(tier, TierStats())
+    stats.calls += 1
+    stats.total_latency_s += latency_s
+    if not ok:
+        stats.failures += 1
+
+    prompt_tokens = prompt_chars // CHARS_PER_TOKEN
+    completion_tokens = completion_chars // CHARS_PER_TOKEN
+    stats.prompt_tokens += prompt_tokens
+    stats.completion_tokens += completion_tokens
+
+    costs = LLM_TIER_COSTS.get(tier, {})
+    stats.estimated_cost += (
+        prompt_tokens / 1000 * costs.get("input", 0.0)
+        + completion_tokens / 1000 * costs.get("output", 0.0)
+    )
+
+
+def _resolve_tier(tier: str) -> str:
+    # 설정되지 않은 티어는 기본 티어로 대체 (단일 엔드포인트 환경 호환)
+    return tier if tier in LLM_TIER_CONFIGS else DEFAULT_TIER
+
+
+# -------------------------------------------------------------------
+# 🔥 출력 검증기
+# -------------------------------------------------------------------
+def non_empty_output(text: str) -> bool:
+    return bool(text and text.strip())
+
+
+def react_step_output(text: str) -> bool:
+    """ReAct 단계 출력은 Action 또는 Answer 를 포함해야 파싱 가능"""
+    return non_empty_output(text) and ("Action:" in text or "Answer:" in text)
+
+
+def _messages_chars(messages: Sequence[ChatMessage]) -> int:
+    return sum(len(m.content or "") for m in messages)
+
 
-def load_llm_model(temperature, top_p, max_tokens):
+class TieredLLM(LLM):
+    """
+    LLM wrapper that calls the routed tier and retries on the fallback tier when the
+    output fails validation (or the call raises). Cost and latency are recorded per tier.
+    """
+
+    _primary: LLM = PrivateAttr()
+    _fallback: Optional[LLM] = PrivateAttr(default=None)
+    _primary_tier: str = PrivateAttr()
+    _fallback_tier: Optional[str] = PrivateAttr(default=None)
+    _validator: Callable[[str], bool] = PrivateAttr()
+
+    def __init__(
+        self,
+        primary: LLM,
+        primary_tier: str,
+        fallback: Optional[LLM] = None,
+        fallback_tier: Optional[str] = None,
+        validator: Callable[[str], bool] = non_empty_output,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self._primary = primary
+        self._primary_tier = primary_tier
+        self._fallback = fallback
+        self._fallback_tier = fallback_tier
+        self._validator = validator
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "TieredLLM"
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return self._primary.metadata
+
+    # ------------------------------------------------------------------
+    def _attempts(self):
+        yield self._primary_tier, self._primary
+        if self._fallback is not None:
+            yield self._fallback_tier, self._fallback
+
+    def _finish(self, tier: str, start: float, prompt_chars: int, text: str, is_last: bool) -> bool:
+        ok = self._validator(text)
+        _record_call(tier, time.perf_counter() - start, prompt_chars, len(text), ok)
+        if not ok and not is_last:
+            _TIER_STATS[tier].fallbacks += 1
+        return ok
+
+    def _fail(self, tier: str, start: float, prompt_chars: int, is_last: bool) -> None:
+        _record_call(tier, time.perf_counter() - start, prompt_chars, 0, ok=False)
+        if not is_last:
+            _TIER_STATS[tier].fallbacks += 1
+
+    async def _arun(self, method: str, payload: Any, prompt_chars: int, text_of, **kwargs: Any):
+        attempts = list(self._attempts())
+        for n, (tier, llm) in enumerate(attempts):
+            is_last = n == len(attempts) - 1
+            start = time.perf_counter()
+            try:
+                response = await getattr(llm, method)(payload, **kwargs)
+            except Exception:
+                self._fail(tier, start, prompt_chars, is_last)
+                if is_last:
+                    raise
+                continue
+            if self._finish(tier, start, prompt_chars, text_of(response), is_last) or is_last:
+                return response
+
+    def _run(self, method: str, payload: Any, prompt_chars: int, text_of, **kwargs: Any):
+        attempts = list(self._attempts())
+        for n, (tier, llm) in enumerate(attempts):
+            is_last = n == len(attempts) - 1
+            start = time.perf_counter()
+            try:
+                response = getattr(llm, method)(payload, **kwargs)
+            except Exception:
+                self._fail(tier, start, prompt_chars, is_last)
+                if is_last:
+                    raise
+                continue
+            if self._finish(tier, start, prompt_chars, text_of(response), is_last) or is_last:
+                return response
+
+    # ------------------------------------------------------------------
+    def chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponse:
+        return self._run("chat", messages, _messages_chars(messages), lambda r: r.message.content or "", **kwargs)
+
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponse:
+        return self._run("complete", prompt, len(prompt), lambda r: r.text or "", formatted=formatted, **kwargs)
+
+    async def achat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponse:
+        return await self._arun("achat", messages, _messages_chars(messages), lambda r: r.message.content or "", **kwargs)
+
+    async def acomplete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponse:
+        return await self._arun("acomplete", prompt, len(prompt), lambda r: r.text or "", formatted=formatted, **kwargs)
+
+    async def astream_chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponseAsyncGen:
+        prompt_chars = _messages_chars(messages)
+        attempts = list(self._attempts())
+
+        async def gen() -> ChatResponseAsyncGen:
+            for n, (tier, llm) in enumerate(attempts):
+                is_last = n == len(attempts) - 1
+                start = time.perf_counter()
+                # fallback 이 남아 있는 시도는 검증을 통과한 뒤에만 내보냄
+                # (실패한 출력과 fallback 출력이 한 스트림에 이어 붙지 않도록)
+                buffered: List[ChatResponse] = []
+                last: Optional[ChatResponse] = None
+                try:
+                    async for response in await llm.astream_chat(messages, **kwargs):
+                        last = response
+                        if is_last:
+                            yield response
+                        else:
+                            buffered.append(response)
+                except Exception:
+                    self._fail(tier, start, prompt_chars, is_last)
+                    if is_last:
+                        raise
+                    continue
+
+                text = (last.message.content or "") if last is not None else ""
+                if self._finish(tier, start, prompt_chars, text, is_last) or is_last:
+                    for response in buffered:
+                        yield response
+                    return
+
+        return gen()
+
+    # 스트리밍 completion / 동기 스트리밍은 라우팅된 티어로만 위임
+    def stream_chat(self, messages: Sequence[ChatMessage], **kwargs: Any) -> ChatResponseGen:
+        return self._primary.stream_chat(messages, **kwargs)
+
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponseGen:
+        return self._primary.stream_complete(prompt, formatted=formatted, **kwargs)
+
+    async def astream_complete(
+        self, prompt: str, formatted: bool = False, **kwargs: Any
+    ) -> CompletionResponseAsyncGen:
+        return await self._primary.astream_complete(prompt, formatted=formatted, **kwargs)
+
+
+def _build_tier_llm(tier: str, temperature, top_p, max_tokens) -> LangChainLLM:
     llm = ChatOpenAI(
-        **LLM_API_CONFIGS,
+        **LLM_TIER_CONFIGS[tier],
         temperature=temperature,
         top_p=top_p,
         max_tokens=max_tokens
     )
+    return LangChainLLM(llm=llm)
 
-    llm_model = LangChainLLM(llm=llm)
-    return llm_model
 
+def load_llm_model(
+    temperature,
+    top_p,
+    max_tokens,
+    route: Optional[str] = None,
+    validator: Callable[[str], bool] = non_empty_output,
+):
+    """
+    route: MODEL_ROUTES 의 에이전트/도구 이름. 라우팅된 티어로 호출하고,
+           출력이 validator 를 통과하지 못하면 FALLBACK_TIERS 의 티어로 재시도.
+    """
+    tier = _resolve_tier(MODEL_ROUTES.get(route, DEFAULT_TIER) if route else DEFAULT_TIER)
+    fallback_tier = FALLBACK_TIERS.get(tier)
+    if fallback_tier is not None:
+        fallback_tier = _resolve_tier(fallback_tier)
+        if fallback_tier == tier:
+            fallback_tier = None
+
+    llm_model = TieredLLM(
+        primary=_build_tier_llm(tier, temperature, top_p, max_tokens),
+        primary_tier=tier,
+        fallback=_build_tier_llm(fallback_tier, temperature, top_p, max_tokens) if fallback_tier else None,
+        fallback_tier=fallback_tier,
+        validator=validator,
+    )
+    return llm_model
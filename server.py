@@ -0,0 +1,223 @@
+"""
+Long-lived README generation service.
+
+Agents, LLM clients and MCP tool definitions are created once when ``main`` is
+imported and shared by every job. Each job passes its own project_root to the
+MCP tools, so up to ``--workers`` jobs run concurrently in one process.
+
+Endpoints:
+    POST /jobs                 submit a job -> {"job_id", "status", "deduplicated"}
+    GET  /jobs                 list jobs
+    GET  /jobs/{job_id}        job status
+    GET  /jobs/{job_id}/events server-sent events (past events replayed, then live)
+    GET  /jobs/{job_id}/result final README (409 while the job is still active)
+    GET  /health               queue statistics
+"""
+import argparse
+import dataclasses
+import json
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+from main import WORKFLOW_FAILED_MESSAGE, ReadmeTarget, generate_readme_for_project, is_workflow_failed, logger
+from utils.job_queue import SUCCEEDED, Job, JobQueue, project_job_key
+
+JOB_QUEUE_KEY = web.AppKey("job_queue", JobQueue)
+
+_TARGET_FIELDS = {f.name for f in dataclasses.fields(ReadmeTarget)}
+
+
+async def _run_readme_job(job: Job, publish):
+    targets = job.params.get("targets")
+    result = await generate_readme_for_project(
+        project_root=job.params["project_root"],
+        user_requirements=job.params.get("user_requirements"),
+        existing_readme_path=job.params.get("existing_readme_path", "README.md"),
+        max_retries=job.params.get("max_retries", 3),
+        on_event=publish,
+        targets=[ReadmeTarget(**t) for t in targets] if targets else None,
+    )
+    # 분석/작성이 실패한 결과는 작업 실패로 기록 (job.error 에 남음)
+    if is_workflow_failed(result):
+        raise RuntimeError(WORKFLOW_FAILED_MESSAGE.splitlines()[0])
+    return result
+
+
+def _parse_targets(raw: Any) -> Optional[List[Dict[str, Any]]]:
+    """
+    Validate the "targets" field. Raises ValueError with a client-facing message.
+    """
+    if raw is None:
+        return None
+    if not isinstance(raw, list) or not raw:
+        raise ValueError("targets must be a non-empty list")
+
+    targets: List[Dict[str, Any]] = []
+    paths = set()
+    for target in raw:
+        if not isinstance(target, dict):
+            raise ValueError("each target must be an object")
+        unknown = set(target) - _TARGET_FIELDS
+        if unknown:
+            raise ValueError(f"unknown target fields: {sorted(unknown)}")
+        if not isinstance(target.get("language"), str) or not target["language"]:
+            raise ValueError("target.language must be a non-empty string")
+        for name in ("path", "requirements"):
+            if name in target and target[name] is not None and not isinstance(target[name], str):
+                raise ValueError(f"target.{name} must be a string")
+
+        path = target.get("path") or "README.md"
+        if path.startswith(("/", "\\")) or ".." in path.replace("\\", "/").split("/"):
+            raise ValueError("target.path must be relative to project_root")
+        if path in paths:
+            raise ValueError(f"duplicate target path: {path}")
+        paths.add(path)
+        targets.append({**target, "path": path})
+
+    return targets
+
+
+def _parse_int(body: Dict[str, Any], name: str, default: int, minimum: Optional[int] = None) -> int:
+    value = body.get(name, default)
+    # bool 은 int 의 하위 클래스이므로 별도로 거부
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name} must be an integer")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}")
+    return value
+
+
+def _get_job_or_404(request: web.Request) -> Job:
+    job = request.app[JOB_QUEUE_KEY].get(request.match_info["job_id"])
+    if job is None:
+        raise web.HTTPNotFound(
+            text=json.dumps({"error": "job not found"}), content_type="application/json"
+        )
+    return job
+
+
+# -------------------------------------------------------------------
+async def submit_job(request: web.Request) -> web.Response:
+    try:
+        body = await request.json()
+    except json.JSONDecodeError:
+        return web.json_response({"error": "request body must be JSON"}, status=400)
+    if not isinstance(body, dict):
+        return web.json_response({"error": "request body must be a JSON object"}, status=400)
+
+    project_root = body.get("project_root")
+    if not project_root or not isinstance(project_root, str):
+        return web.json_response({"error": "project_root is required"}, status=400)
+
+    try:
+        params = {
+            "project_root": project_root,
+            "user_requirements": body.get("user_requirements"),
+            "existing_readme_path": body.get("existing_readme_path", "README.md"),
+            "max_retries": _parse_int(body, "max_retries", 3, minimum=1),
+            # [{"language": "en", "path": "README.en.md", "requirements": "..."}]
+            "targets": _parse_targets(body.get("targets")),
+        }
+        priority = _parse_int(body, "priority", 0)
+    except ValueError as e:
+        return web.json_response({"error": str(e)}, status=400)
+
+    key = project_job_key(
+        params["project_root"],
+        params["user_requirements"],
+        params["existing_readme_path"],
+        targets=params["targets"],
+    )
+    job, deduplicated = request.app[JOB_QUEUE_KEY].submit(key, params, priority=priority)
+
+    logger.info(f"📥 Job {job.job_id} ({'dedup' if deduplicated else 'new'}): {project_root}")
+    return web.json_response(
+        {"job_id": job.job_id, "status": job.status, "deduplicated": deduplicated},
+        status=202,
+    )
+
+
+async def list_jobs(request: web.Request) -> web.Response:
+    return web.json_response([job.to_dict() for job in request.app[JOB_QUEUE_KEY].list_jobs()])
+
+
+async def get_job(request: web.Request) -> web.Response:
+    return web.json_response(_get_job_or_404(request).to_dict())
+
+
+async def get_job_result(request: web.Request) -> web.Response:
+    job = _get_job_or_404(request)
+    if not job.done:
+        return web.json_response({"status": job.status}, status=409)
+    if job.status != SUCCEEDED:
+        return web.json_response({"status": job.status, "error": job.error}, status=500)
+    return web.json_response({"status": job.status, "result": job.result})
+
+
+async def stream_job_events(request: web.Request) -> web.StreamResponse:
+    job = _get_job_or_404(request)
+
+    response = web.StreamResponse(
+        headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"}
+    )
+    await response.prepare(request)
+
+    queue = job.subscribe()
+    try:
+        while True:
+            event = await queue.get()
+            if event is None:
+                break
+            payload = json.dumps(event, ensure_ascii=False, default=str)
+            await response.write(f"event: {event.get('type', 'message')}\ndata: {payload}\n\n".encode("utf-8"))
+    finally:
+        job.unsubscribe(queue)
+
+    return response
+
+
+async def health(request: web.Request) -> web.Response:
+    return web.json_response(request.app[JOB_QUEUE_KEY].stats())
+
+
+# -------------------------------------------------------------------
+def create_app(max_workers: int = 1) -> web.Application:
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    app = web.Application()
+
+    async def _start_queue(app: web.Application) -> None:
+        app[JOB_QUEUE_KEY] = JobQueue(_run_readme_job, max_workers=max_workers)
+        app[JOB_QUEUE_KEY].start()
+
+    async def _stop_queue(app: web.Application) -> None:
+        await app[JOB_QUEUE_KEY].stop()
+
+    app.on_startup.append(_start_queue)
+    app.on_cleanup.append(_stop_queue)
+
+    app.router.add_post("/jobs", submit_job)
+    app.router.add_get("/jobs", list_jobs)
+    app.router.add_get("/jobs/{job_id}", get_job)
+    app.router.add_get("/jobs/{job_id}/events", stream_job_events)
+    app.router.add_get("/jobs/{job_id}/result", get_job_result)
+    app.router.add_get("/health", health)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ReadmeAgent README 생성 서비스")
+    parser.add_argument("--host", default="localhost", type=str)
+    parser.add_argument("--port", default=8080, type=int)
+    parser.add_argument(
+        "--workers",
+        default=1,
+        type=int,
+        help="동시에 실행할 README 작업 수",
+    )
+    server_args = parser.parse_args()
+    if server_args.workers < 1:
+        parser.error("--workers 는 1 이상이어야 합니다.")
+
+    web.run_app(create_app(max_workers=server_args.workers), host=server_args.host, port=server_args.port)
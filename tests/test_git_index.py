@@ -0,0 +1,123 @@
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from utils.git_index import (
+    GitIndexError,
+    file_blob_hash,
+    git_blob_hash,
+    index_entry_for,
+    parse_index,
+    tracked_files,
+)
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+FILES = {
+    "README.md": "# demo\n",
+    "src/app.py": "print('hello')\n",
+    "src/pkg/__init__.py": "",
+    "src/pkg/util.py": "def f():\n    return 1\n",
+    "docs/guide.md": "guide\n",
+}
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+
+def _ls_files(repo: Path):
+    entries = []
+    for line in _git(repo, "ls-files", "-s").splitlines():
+        meta, path = line.split("\t", 1)
+        mode, sha1, _stage = meta.split()
+        entries.append((path, sha1, int(mode, 8)))
+    return entries
+
+
+@pytest.fixture
+def repo(tmp_path) -> Path:
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+
+    # 파일 mtime 을 과거로 돌려 racy-git 판정(index 와 같은 시각)을 피함
+    past = time.time() - 60
+    for rel_path, content in FILES.items():
+        path = repo / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        os.utime(path, (past, past))
+
+    _git(repo, "add", "-A")
+    return repo
+
+
+@pytest.mark.parametrize("version", [2, 3, 4])
+def test_parse_index_matches_git(repo, version):
+    _git(repo, "update-index", "--index-version", str(version))
+
+    entries = parse_index((repo / ".git" / "index").read_bytes())
+    assert [(e.path, e.sha1, e.mode) for e in entries] == _ls_files(repo)
+    assert {e.path: e.size for e in entries} == {p: len(c.encode()) for p, c in FILES.items()}
+
+
+def test_parse_index_rejects_bad_signature():
+    with pytest.raises(GitIndexError):
+        parse_index(b"NOPE" + b"\0" * 16)
+    with pytest.raises(GitIndexError):
+        parse_index(b"DIR")
+
+
+def test_tracked_files_relative_to_root(repo):
+    assert [rel for rel, _ in tracked_files(str(repo))] == sorted(FILES)
+
+    src = tracked_files(str(repo / "src"))
+    assert [rel for rel, _ in src] == ["app.py", "pkg/__init__.py", "pkg/util.py"]
+    assert dict(src)["app.py"].path == "src/app.py"
+
+
+def test_tracked_files_none_without_tracked_files(repo, tmp_path):
+    untracked = repo / "build"
+    untracked.mkdir()
+    (untracked / "out.txt").write_text("generated\n")
+
+    assert tracked_files(str(untracked)) is None
+    assert tracked_files(str(tmp_path)) is None  # git 저장소 밖
+
+
+def test_tracked_files_picks_up_index_changes(repo):
+    assert len(tracked_files(str(repo))) == len(FILES)
+
+    _git(repo, "rm", "-q", "--cached", "docs/guide.md")
+    assert "docs/guide.md" not in [rel for rel, _ in tracked_files(str(repo))]
+
+
+def test_git_blob_hash_matches_git(repo):
+    for rel_path, content in FILES.items():
+        expected = _git(repo, "hash-object", rel_path).strip()
+        assert git_blob_hash(content.encode()) == expected
+        assert file_blob_hash(str(repo / rel_path)) == expected
+
+
+def test_index_entry_for_unchanged_and_modified_files(repo):
+    target = repo / "src" / "app.py"
+    entry = index_entry_for(str(target))
+    assert entry is not None and entry.path == "src/app.py"
+
+    # 수정된 파일은 index 의 해시를 쓰지 않고 내용을 다시 해시
+    target.write_text("print('changed')\n")
+    assert index_entry_for(str(target)) is None
+    assert file_blob_hash(str(target)) == _git(repo, "hash-object", "src/app.py").strip()
+
+    assert index_entry_for(str(repo / "untracked.txt")) is None
@@ -0,0 +1,180 @@
+import asyncio
+import importlib
+import sys
+import types
+from typing import Any
+
+import pytest
+
+pytest.importorskip("llama_index.core")
+pytest.importorskip("llama_index.llms.langchain")
+pytest.importorskip("langchain_openai")
+
+from llama_index.core.base.llms.types import CompletionResponse, LLMMetadata  # noqa: E402
+from llama_index.core.llms import ChatMessage, CustomLLM  # noqa: E402
+from llama_index.core.llms.callbacks import llm_completion_callback  # noqa: E402
+
+
+class FakeLLM(CustomLLM):
+    """Scripted tier: returns ``text`` (streamed word by word) or raises when ``error`` is set."""
+
+    text: str = ""
+    error: bool = False
+    calls: int = 0
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(model_name="fake")
+
+    @llm_completion_callback()
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponse:
+        self.calls += 1
+        if self.error:
+            raise RuntimeError("endpoint unavailable")
+        return CompletionResponse(text=self.text)
+
+    @llm_completion_callback()
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any):
+        self.calls += 1
+        if self.error:
+            raise RuntimeError("endpoint unavailable")
+
+        def gen():
+            text = ""
+            for word in self.text.split(" "):
+                delta = word if not text else " " + word
+                text += delta
+                yield CompletionResponse(text=text, delta=delta)
+
+        return gen()
+
+
+@pytest.fixture
+def model(monkeypatch):
+    # configs.py 는 배포 환경마다 따로 두는 파일: 없으면 (호출되지 않는) 로컬 엔드포인트 설정으로 대체
+    try:
+        importlib.import_module("configs")
+    except ImportError:
+        configs = types.ModuleType("configs")
+        configs.LLM_API_CONFIGS = {"base_url": "http://localhost:9/v1", "api_key": "test", "model": "mock"}
+        monkeypatch.setitem(sys.modules, "configs", configs)
+
+    module = importlib.import_module("model")
+    monkeypatch.setattr(module, "_TIER_STATS", {})
+    return module
+
+
+def _tiered(model, primary: FakeLLM, fallback: FakeLLM, validator=None):
+    return model.TieredLLM(
+        primary=primary,
+        primary_tier="fast",
+        fallback=fallback,
+        fallback_tier="strong",
+        validator=validator or model.react_step_output,
+    )
+
+
+def _chat(llm, text: str = "hi"):
+    return asyncio.run(llm.achat([ChatMessage(role="user", content=text)]))
+
+
+def _stream(llm):
+    async def collect():
+        gen = await llm.astream_chat([ChatMessage(role="user", content="hi")])
+        return [chunk async for chunk in gen]
+
+    return asyncio.run(collect())
+
+
+def test_valid_primary_output_skips_fallback(model):
+    primary = FakeLLM(text="Thought: done\nAnswer: ok")
+    fallback = FakeLLM(text="Answer: strong")
+
+    response = _chat(_tiered(model, primary, fallback))
+
+    assert response.message.content == "Thought: done\nAnswer: ok"
+    assert (primary.calls, fallback.calls) == (1, 0)
+    stats = model.get_tier_stats()
+    assert stats["fast"]["calls"] == 1 and stats["fast"]["fallbacks"] == 0
+    assert "strong" not in stats
+
+
+def test_invalid_primary_output_falls_back(model):
+    primary = FakeLLM(text="I am not a ReAct step")
+    fallback = FakeLLM(text="Thought: retry\nAnswer: ok")
+
+    response = _chat(_tiered(model, primary, fallback))
+
+    assert response.message.content == "Thought: retry\nAnswer: ok"
+    assert (primary.calls, fallback.calls) == (1, 1)
+    stats = model.get_tier_stats()
+    assert stats["fast"]["failures"] == 1 and stats["fast"]["fallbacks"] == 1
+    assert stats["strong"]["calls"] == 1 and stats["strong"]["failures"] == 0
+
+
+def test_primary_exception_falls_back(model):
+    primary = FakeLLM(error=True)
+    fallback = FakeLLM(text="done")
+
+    response = asyncio.run(
+        _tiered(model, primary, fallback, validator=model.non_empty_output).acomplete("prompt")
+    )
+
+    assert response.text == "done"
+    stats = model.get_tier_stats()
+    assert stats["fast"]["failures"] == 1 and stats["fast"]["fallbacks"] == 1
+
+
+def test_last_tier_result_is_returned_even_if_invalid(model):
+    primary = FakeLLM(text="")
+    fallback = FakeLLM(text="still not react")
+
+    response = _chat(_tiered(model, primary, fallback))
+
+    assert response.message.content == "still not react"
+    assert model.get_tier_stats()["strong"]["failures"] == 1
+
+
+def test_last_tier_exception_is_raised(model):
+    llm = _tiered(model, FakeLLM(error=True), FakeLLM(error=True))
+
+    with pytest.raises(RuntimeError, match="endpoint unavailable"):
+        _chat(llm)
+
+
+def test_sync_chat_uses_the_same_routing(model):
+    primary = FakeLLM(text="")
+    fallback = FakeLLM(text="Answer: sync")
+
+    response = _tiered(model, primary, fallback).chat([ChatMessage(role="user", content="hi")])
+
+    assert response.message.content == "Answer: sync"
+
+
+def test_stream_replays_validated_primary_chunks(model):
+    primary = FakeLLM(text="Thought: a\nAnswer: streamed words")
+    fallback = FakeLLM(text="Answer: strong")
+
+    chunks = _stream(_tiered(model, primary, fallback))
+
+    assert "".join(c.delta for c in chunks) == "Thought: a\nAnswer: streamed words"
+    assert len(chunks) > 1
+    assert fallback.calls == 0
+
+
+def test_stream_drops_invalid_primary_chunks(model):
+    primary = FakeLLM(text="rambling without an action")
+    fallback = FakeLLM(text="Thought: b\nAnswer: from fallback")
+
+    chunks = _stream(_tiered(model, primary, fallback))
+
+    # 검증에 실패한 첫 티어의 토큰은 스트림에 섞이지 않음
+    assert "".join(c.delta for c in chunks) == "Thought: b\nAnswer: from fallback"
+    assert chunks[-1].message.content == "Thought: b\nAnswer: from fallback"
+    assert model.get_tier_stats()["fast"]["fallbacks"] == 1
+
+
+def test_stream_falls_back_when_primary_raises(model):
+    chunks = _stream(_tiered(model, FakeLLM(error=True), FakeLLM(text="Answer: ok")))
+
+    assert chunks[-1].message.content == "Answer: ok"
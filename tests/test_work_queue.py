@@ -0,0 +1,188 @@
+import threading
+import time
+
+import pytest
+
+from utils.work_queue import (
+    DEAD,
+    DONE,
+    LEASED,
+    MOVING,
+    QUEUED,
+    FileSystemWorkQueue,
+    WorkQueue,
+    open_work_queue,
+)
+
+
+@pytest.fixture(params=["sqlite", "fs"])
+def queue(request, tmp_path) -> WorkQueue:
+    location = tmp_path / ("queue.db" if request.param == "sqlite" else "queue")
+    return open_work_queue(request.param, str(location), max_attempts=2)
+
+
+def _expire(queue: WorkQueue, item) -> None:
+    # lease 만료를 흉내: 짧은 lease 로 잡은 뒤 시간이 지나도록 대기
+    time.sleep(max(0.0, item.lease_until - time.time()) + 0.01)
+
+
+def test_work_queue_is_abstract():
+    with pytest.raises(TypeError):
+        WorkQueue()
+
+
+def test_enqueue_deduplicates_active_items(queue):
+    item_id, dedup = queue.enqueue("k1", {"project_root": "/a"})
+    assert not dedup
+    assert queue.enqueue("k1", {"project_root": "/a"}) == (item_id, True)
+
+    item = queue.claim("w1", lease_seconds=60)
+    assert queue.enqueue("k1", {"project_root": "/a"}) == (item_id, True)
+
+    assert queue.complete(item, "readme", {"duration_s": 1.0})
+    new_id, dedup = queue.enqueue("k1", {"project_root": "/a"})
+    assert not dedup and new_id != item_id
+    assert queue.stats()[QUEUED] == 1 and queue.stats()[DONE] == 0
+
+
+def test_claim_order_and_completion(queue):
+    queue.enqueue("low", {"project_root": "/low"}, priority=5)
+    queue.enqueue("high", {"project_root": "/high"}, priority=0)
+
+    first = queue.claim("w1", lease_seconds=60)
+    second = queue.claim("w1", lease_seconds=60)
+    assert [first.key, second.key] == ["high", "low"]
+    assert queue.claim("w1", lease_seconds=60) is None
+
+    assert queue.heartbeat(first, lease_seconds=60)
+    assert queue.complete(first, "readme", {"duration_s": 1.0})
+    assert queue.stats() == {QUEUED: 0, LEASED: 1, DONE: 1, DEAD: 0}
+
+    done = queue.items(DONE)
+    assert [(i.key, i.result, i.metrics) for i in done] == [("high", "readme", {"duration_s": 1.0})]
+
+
+def test_fail_retries_then_dead_letters(queue):
+    queue.enqueue("k", {"project_root": "/a"})
+
+    item = queue.claim("w1", lease_seconds=60)
+    assert queue.fail(item, "boom", retry_delay=0.2) == QUEUED
+    assert queue.claim("w1", lease_seconds=60) is None  # backoff 중
+
+    time.sleep(0.25)
+    item = queue.claim("w1", lease_seconds=60)
+    assert item.attempts == 2
+    assert queue.fail(item, "boom again") == DEAD
+    assert [(i.key, i.error) for i in queue.items(DEAD)] == [("k", "boom again")]
+
+
+def test_expired_lease_is_fenced(queue):
+    queue.enqueue("k", {"project_root": "/a"})
+    stale = queue.claim("w1", lease_seconds=0.05)
+    _expire(queue, stale)
+
+    fresh = queue.claim("w2", lease_seconds=60)
+    assert fresh is not None and fresh.lease_owner == "w2" and fresh.attempts == 2
+
+    # 이전 워커는 더 이상 보고할 수 없음
+    assert not queue.heartbeat(stale, lease_seconds=60)
+    assert not queue.complete(stale, "stale", {})
+    assert queue.fail(stale, "stale") is None
+
+    assert queue.complete(fresh, "readme", {})
+    assert queue.stats() == {QUEUED: 0, LEASED: 0, DONE: 1, DEAD: 0}
+    assert queue.items(DONE)[0].result == "readme"
+
+
+def test_expired_lease_dead_letters_after_max_attempts(queue):
+    queue.enqueue("k", {"project_root": "/a"})
+    for _ in range(2):
+        item = queue.claim("w1", lease_seconds=0.05)
+        _expire(queue, item)
+
+    assert queue.claim("w1", lease_seconds=60) is None
+    assert queue.stats()[DEAD] == 1
+
+
+def test_concurrent_claims_lease_each_item_once(queue):
+    keys = [f"k{i}" for i in range(20)]
+    for key in keys:
+        queue.enqueue(key, {"project_root": f"/{key}"})
+
+    claimed = []
+    lock = threading.Lock()
+
+    def worker(worker_id: str) -> None:
+        while True:
+            item = queue.claim(worker_id, lease_seconds=60)
+            if item is None:
+                return
+            with lock:
+                claimed.append(item.key)
+            assert queue.complete(item, worker_id, {})
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(claimed) == sorted(keys)
+    assert queue.stats() == {QUEUED: 0, LEASED: 0, DONE: len(keys), DEAD: 0}
+
+
+def test_fs_heartbeat_racing_reclaim_does_not_duplicate(tmp_path):
+    queue = FileSystemWorkQueue(str(tmp_path / "queue"), max_attempts=3)
+    queue.enqueue("k", {"project_root": "/a"})
+    stale = queue.claim("w1", lease_seconds=0.05)
+    _expire(queue, stale)
+
+    # 만료된 lease 를 다른 워커가 회수(claim)하는 동안 이전 워커가 heartbeat/complete 시도
+    results = []
+    reclaimed = []
+    barrier = threading.Barrier(2)
+
+    def old_owner() -> None:
+        barrier.wait()
+        results.append(queue.heartbeat(stale, lease_seconds=60))
+        results.append(queue.complete(stale, "stale", {}))
+
+    def reclaimer() -> None:
+        barrier.wait()
+        reclaimed.append(queue.claim("w2", lease_seconds=60))
+
+    threads = [threading.Thread(target=old_owner), threading.Thread(target=reclaimer)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 항목은 정확히 한 곳에만 존재
+    stats = queue.stats()
+    assert sum(stats.values()) == 1
+    assert not list((tmp_path / "queue" / MOVING).glob("*.json"))
+    if reclaimed[0] is not None:
+        # 회수가 이겼으면 이전 워커의 보고는 모두 거부됨
+        assert results == [False, False]
+        assert stats[LEASED] == 1
+    else:
+        # 이전 워커가 먼저 연장/완료했다면 회수할 항목이 없음
+        assert results == [True, True]
+        assert stats[DONE] == 1
+
+
+def test_fs_reclaims_item_stranded_while_moving(tmp_path, monkeypatch):
+    queue = FileSystemWorkQueue(str(tmp_path / "queue"), max_attempts=3)
+    queue.enqueue("k", {"project_root": "/a"})
+    item = queue.claim("w1", lease_seconds=0.05)
+
+    # heartbeat 도중(moving/ 으로 옮긴 직후) 워커가 죽은 상황
+    staging = queue._take(queue._leased_path(item))
+    assert staging is not None
+    assert queue.claim("w2", lease_seconds=60) is None  # 유예 시간 동안은 회수하지 않음
+
+    monkeypatch.setattr("utils.work_queue.MOVE_GRACE_SECONDS", 0.0)
+    _expire(queue, item)
+    recovered = queue.claim("w2", lease_seconds=60)
+    assert recovered is not None and recovered.key == "k" and recovered.attempts == 2
+    assert queue.stats() == {QUEUED: 0, LEASED: 1, DONE: 0, DEAD: 0}
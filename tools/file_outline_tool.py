@@ -0,0 +1,259 @@
+import ast
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from llama_index.core.tools import FunctionTool
+from utils.content_store import content_hash, get_content_store
+
+# 같은 내용의 파일은 다시 파싱하지 않도록 내용 해시 기준으로 캐시
+# (프로세스 메모리 → 프로젝트 간 공유되는 디스크 content store 순으로 조회)
+_OUTLINE_CACHE: Dict[str, Dict[str, Any]] = {}
+
+# outline 형식이 바뀌면 올려서 기존 디스크 캐시를 무효화
+OUTLINE_ARTIFACT = "outline_v1"
+
+LANGUAGE_BY_SUFFIX = {
+    ".py": "python",
+    ".pyi": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".cjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".go": "go",
+    ".rs": "rust",
+    ".java": "java",
+    ".kt": "kotlin",
+    ".cs": "csharp",
+    ".c": "c",
+    ".h": "c",
+    ".cpp": "cpp",
+    ".hpp": "cpp",
+    ".cc": "cpp",
+    ".rb": "ruby",
+    ".php": "php",
+    ".swift": "swift",
+    ".sh": "shell",
+    ".md": "markdown",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".toml": "toml",
+    ".ini": "ini",
+    ".cfg": "ini",
+}
+
+# 언어별 "구조적으로 의미 있는 줄" 패턴 (휴리스틱)
+_HEURISTIC_PATTERNS = {
+    "javascript": r"^\s*(export\s+)?(default\s+)?(async\s+)?(function\*?|class)\s+\w+|^\s*(export\s+)?(const|let|var)\s+\w+\s*=\s*(async\s*)?(\([^)]*\)|\w+)\s*=>|^\s*module\.exports\b|^\s*export\s+(default\s+)?\{",
+    "typescript": r"^\s*(export\s+)?(default\s+)?(declare\s+)?(abstract\s+)?(async\s+)?(function\*?|class|interface|type|enum|namespace)\s+\w+|^\s*(export\s+)?(const|let)\s+\w+\s*(:[^=]+)?=\s*(async\s*)?(\([^)]*\)|\w+)\s*=>",
+    "go": r"^(func|type|package)\s+",
+    "rust": r"^\s*(pub(\([^)]*\))?\s+)?(async\s+)?(fn|struct|enum|trait|impl|mod|type|macro_rules!)\b",
+    "java": r"^\s*(public|protected|private|static|abstract|final|\s)*\s*(class|interface|enum|record|@interface)\s+\w+|^\s*(public|protected|private)\s+[\w<>\[\], ?]+\s+\w+\s*\(",
+    "kotlin": r"^\s*(public|private|internal|protected|open|abstract|data|sealed|suspend|override|\s)*\s*(class|interface|object|fun|enum\s+class)\s+\w+",
+    "csharp": r"^\s*(public|protected|private|internal|static|abstract|sealed|partial|async|override|virtual|\s)*\s*(class|interface|struct|enum|record|namespace)\s+\w+|^\s*(public|protected|internal)\s+[\w<>\[\], ?]+\s+\w+\s*\(",
+    "c": r"^\s*(typedef\s+)?(struct|enum|union)\s+\w+|^#define\s+\w+|^[A-Za-z_][\w\s\*]*\s+\**\w+\s*\([^;]*\)\s*\{?\s*$",
+    "cpp": r"^\s*(template\s*<.*>\s*)?(class|struct|enum|union|namespace)\s+\w+|^#define\s+\w+|^[A-Za-z_][\w:<>\s\*&]*\s+[\*&]*[\w:~]+\s*\([^;]*\)\s*(const)?\s*\{?\s*$",
+    "ruby": r"^\s*(class|module|def)\s+",
+    "php": r"^\s*(abstract\s+|final\s+)?(class|interface|trait|function)\s+\w+|^\s*(public|protected|private)\s+(static\s+)?function\s+\w+",
+    "swift": r"^\s*(public|private|internal|open|fileprivate|\s)*\s*(class|struct|enum|protocol|extension|func)\s+\w+",
+    "shell": r"^\s*(function\s+)?\w+\s*\(\)\s*\{|^\s*function\s+\w+",
+    "markdown": r"^#{1,6}\s+",
+    "yaml": r"^[A-Za-z0-9_\-\"']+\s*:",
+    "toml": r"^\s*\[[^\]]+\]",
+    "ini": r"^\s*\[[^\]]+\]",
+}
+_GENERIC_PATTERN = r"^\s*(export\s+)?(pub\s+)?(async\s+)?(def|class|function|func|fn|interface|struct|enum|trait|module|type)\s+\w+"
+
+
+def _first_doc_line(node: ast.AST) -> Optional[str]:
+    doc = ast.get_docstring(node, clean=True)
+    if not doc:
+        return None
+    return doc.strip().splitlines()[0]
+
+
+def _format_function(node: ast.AST, indent: str) -> List[str]:
+    lines = [f"{indent}@{ast.unparse(d)}" for d in node.decorator_list]
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+    signature = f"{indent}{prefix} {node.name}({ast.unparse(node.args)}){returns}  # L{node.lineno}"
+    lines.append(signature)
+
+    doc = _first_doc_line(node)
+    if doc:
+        lines.append(f'{indent}    """{doc}"""')
+    return lines
+
+
+def _format_class(node: ast.ClassDef, indent: str) -> List[str]:
+    lines = [f"{indent}@{ast.unparse(d)}" for d in node.decorator_list]
+    bases = [ast.unparse(b) for b in node.bases] + [ast.unparse(k) for k in node.keywords]
+    base_str = f"({', '.join(bases)})" if bases else ""
+    lines.append(f"{indent}class {node.name}{base_str}:  # L{node.lineno}")
+
+    doc = _first_doc_line(node)
+    if doc:
+        lines.append(f'{indent}    """{doc}"""')
+
+    for child in node.body:
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            lines.extend(_format_function(child, indent + "    "))
+        elif isinstance(child, ast.ClassDef):
+            lines.extend(_format_class(child, indent + "    "))
+        elif isinstance(child, ast.AnnAssign) and isinstance(child.target, ast.Name):
+            lines.append(f"{indent}    {child.target.id}: {ast.unparse(child.annotation)}")
+    return lines
+
+
+def _python_outline(text: str) -> List[str]:
+    tree = ast.parse(text)
+    lines: List[str] = []
+
+    doc = _first_doc_line(tree)
+    if doc:
+        lines.append(f'"""{doc}"""')
+
+    imports: List[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append(f"{'.' * node.level}{node.module or ''}")
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            lines.extend(_format_function(node, ""))
+        elif isinstance(node, ast.ClassDef):
+            lines.extend(_format_class(node, ""))
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = [t.id for t in targets if isinstance(t, ast.Name)]
+            # 모듈 수준 상수·객체 (값은 짧게 요약)
+            if names:
+                value = ast.unparse(node.value) if node.value is not None else ""
+                if len(value) > 60:
+                    value = value[:57] + "..."
+                lines.append(f"{', '.join(names)} = {value}  # L{node.lineno}")
+        elif isinstance(node, ast.If) and ast.unparse(node.test).replace("'", '"') == '__name__ == "__main__"':
+            lines.append(f'if __name__ == "__main__": ...  # L{node.lineno}')
+
+    if imports:
+        unique = list(dict.fromkeys(imports))
+        lines.insert(1 if doc else 0, f"# imports: {', '.join(unique)}")
+    return lines
+
+
+def _heuristic_outline(text: str, language: str) -> List[str]:
+    pattern = re.compile(_HEURISTIC_PATTERNS.get(language, _GENERIC_PATTERN))
+    lines: List[str] = []
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        if pattern.search(line):
+            stripped = line.rstrip()
+            if len(stripped) > 160:
+                stripped = stripped[:157] + "..."
+            lines.append(f"{stripped}  # L{lineno}")
+    return lines
+
+
+def _build_outline(text: str, language: str) -> Tuple[List[str], str]:
+    if language == "python":
+        try:
+            return _python_outline(text), "ast"
+        except SyntaxError:
+            pass
+    return _heuristic_outline(text, language), "heuristic"
+
+
+def _get_file_outline(file_path: str, max_lines: int = 300) -> Dict[str, Any]:
+    """
+    Return a compact structural skeleton of a source file instead of its full content.
+    """
+    p = Path(file_path)
+
+    # README.md는 스킵
+    if p.name.lower() == "readme.md":
+        return {
+            "outline": "",
+            "skipped": True,
+            "message": "README.md is excluded from FileViewerAgent file reading.",
+        }
+
+    if not p.exists():
+        return {"outline": "", "error": f"File not found: {file_path}"}
+
+    try:
+        raw = p.read_bytes()
+    except Exception as e:
+        return {"outline": "", "error": f"Failed to read file {file_path}: {e}"}
+
+    digest = content_hash(raw)
+    cached = digest in _OUTLINE_CACHE
+
+    if not cached:
+        store = get_content_store()
+        stored = store.get(digest, OUTLINE_ARTIFACT)
+        cached = stored is not None
+
+        if stored is None:
+            text = raw.decode("utf-8", errors="ignore")
+            language = LANGUAGE_BY_SUFFIX.get(p.suffix.lower(), "unknown")
+            outline_lines, method = _build_outline(text, language)
+            stored = {
+                "language": language,
+                "method": method,
+                "line_count": text.count("\n") + 1,
+                "char_count": len(text),
+                "outline_lines": outline_lines,
+            }
+            try:
+                store.put(digest, OUTLINE_ARTIFACT, stored)
+            except OSError:
+                # 공유 store 에 쓸 수 없으면 (읽기 전용, 권한 등) 이번 프로세스 캐시만 사용
+                pass
+
+        _OUTLINE_CACHE[digest] = stored
+
+    entry = _OUTLINE_CACHE[digest]
+    outline_lines = entry["outline_lines"]
+    truncated = len(outline_lines) > max_lines
+    outline = "\n".join(outline_lines[:max_lines])
+    if truncated:
+        outline += f"\n\n[TRUNCATED] {len(outline_lines) - max_lines} more outline lines"
+
+    return {
+        "path": str(p),
+        "language": entry["language"],
+        "method": entry["method"],
+        "line_count": entry["line_count"],
+        "char_count": entry["char_count"],
+        "outline": outline,
+        "truncated": truncated,
+        "cached": cached,
+        "content_hash": digest,
+    }
+
+
+
+
+# ==============================================================================================================
+get_file_outline = FunctionTool.from_defaults(
+    fn=_get_file_outline,
+    name="get_file_outline",
+    description=(
+        "Return a compact skeleton of a (large) source file instead of its full text.\n\n"
+        "For Python files the outline is built from the AST: module docstring, imports, top-level "
+        "assignments, classes with bases and decorators, function/method signatures with type hints, "
+        "and the first line of every docstring. Other languages (JS/TS, Go, Rust, Java, C/C++, Markdown, "
+        "YAML, TOML, ...) get a heuristic outline of declaration lines. Every entry carries its line "
+        "number (`# L<n>`) so `read_file_chunk(file_path, start_line=n, end_line=...)` can be used to "
+        "zoom into a specific part.\n\n"
+        "Prefer this tool over paging through a big file with `read_file_chunk` when you only need "
+        "the structure and public API. Outlines are cached by file content hash in a store shared "
+        "across projects, so identical (e.g. vendored) files are only parsed once.\n\n"
+        "Args:\n"
+        "  file_path (str): Path to the file to outline.\n"
+        "  max_lines (int, optional): Maximum outline lines to return. Defaults to 300.\n\n"
+        "Returns:\n"
+        "  dict: 'outline' text plus 'language', 'method' ('ast' or 'heuristic'), 'line_count', "
+        "'char_count', 'truncated' and 'cached', or a skip/error entry.\n"
+    ),
+)
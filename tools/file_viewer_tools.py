@@ -1,7 +1,17 @@
+import asyncio
+import glob
+import os
+import time
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from llama_index.core.tools import FunctionTool
 from llama_index.core.workflow import Context
+from utils.content_store import file_content_hash, get_content_store
+from utils.git_index import tracked_files
+
+# content store 에 저장되는 파일 요약 노트 artifact 이름
+SUMMARY_ARTIFACT = "summary"
+SUMMARY_PREFIX = "[SUMMARY]"
 
 EXCLUDED_DIRS = {
     "__pycache__",
@@ -17,8 +27,83 @@ EXCLUDED_DIRS = {
     ".github",
 }
 
-def _get_directory_structure(root_path: str) -> Dict[str, Any]:
+def is_skipped_dir(name: str) -> bool:
+    """Directories never analyzed: EXCLUDED_DIRS and hidden directories."""
+    return name in EXCLUDED_DIRS or name.startswith(".")
+
+
+def in_skipped_dir(rel_path: str) -> bool:
+    """True if a directory component of the posix path ``rel_path`` (e.g. a git index path) is skipped."""
+    return any(is_skipped_dir(d) for d in rel_path.split("/")[:-1])
+
+
+def excluded_rel_paths(root: Path, exclude: Optional[List[str]]) -> List[str]:
+    """
+    Posix paths (relative to ``root``) of the excluded directories below ``root``.
+    ``exclude`` entries may be absolute or relative to ``root``.
+    """
+    rel_paths: List[str] = []
+    for entry in exclude or []:
+        path = (root / entry).resolve()
+        if path != root and root in path.parents:
+            rel_paths.append(path.relative_to(root).as_posix())
+    return rel_paths
+
+
+def _is_excluded(rel_path: str, excluded: List[str]) -> bool:
+    return any(rel_path == e or rel_path.startswith(e + "/") for e in excluded)
+
+
+def _structure_from_git_index(root: Path, excluded: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Build the directory tree from the git index (tracked files only), or None outside git
+    or when nothing under ``root`` is tracked.
+    """
+    files = tracked_files(str(root))
+    if files is None:
+        return None
+
+    def _node(path: str) -> Dict[str, Any]:
+        return {"path": path, "dirs": [], "files": [], "file_paths": [], "_children": {}}
+
+    tree = _node(str(root))
+    for rel_path, _ in files:
+        # walk 와 동일한 제외 규칙 (숨김/제외 디렉토리)
+        if in_skipped_dir(rel_path):
+            continue
+        *rel_dirs, name = rel_path.split("/")
+        if excluded and _is_excluded(rel_path, excluded):
+            continue
+
+        node = tree
+        for part in rel_dirs:
+            child = node["_children"].get(part)
+            if child is None:
+                child = _node(os.path.join(node["path"], part))
+                node["_children"][part] = child
+                node["dirs"].append(child)
+            node = child
+
+        node["files"].append(name)
+        node["file_paths"].append(os.path.join(node["path"], name))
+
+    def _strip(node: Dict[str, Any]) -> Dict[str, Any]:
+        node.pop("_children")
+        for child in node["dirs"]:
+            _strip(child)
+        return node
+
+    return _strip(tree)
+
+
+def _get_directory_structure(root_path: str, exclude: Optional[List[str]] = None) -> Dict[str, Any]:
     root = Path(root_path).resolve()
+    excluded = excluded_rel_paths(root, exclude)
+
+    # git 저장소는 index 에서 추적 파일만 바로 나열 (빌드 산출물 등 untracked 파일 제외)
+    from_index = _structure_from_git_index(root, excluded)
+    if from_index is not None:
+        return from_index
 
     def _walk(dir_path: Path) -> Dict[str, Any]:
         dirs: List[Dict[str, Any]] = []
@@ -31,6 +116,8 @@ def _get_directory_structure(root_path: str) -> Dict[str, Any]:
                 continue
             if p.name.startswith(".") and p.is_dir():
                 continue
+            if excluded and p.is_dir() and _is_excluded(p.relative_to(root).as_posix(), excluded):
+                continue
 
             if p.is_dir():
                 dirs.append(_walk(p))
@@ -47,7 +134,7 @@ def _get_directory_structure(root_path: str) -> Dict[str, Any]:
 
     return _walk(root)
 
-def _read_file(file_path: str, max_chars: int = 8000) -> str:
+def _read_file(file_path: str, max_chars: int = 8000, prefer_summary: bool = True) -> str:
     p = Path(file_path)
 
     # ✅ README.md는 읽지 않도록 차단 (대소문자 무시)
@@ -57,6 +144,15 @@ def _read_file(file_path: str, max_chars: int = 8000) -> str:
     if not p.exists():
         return f"[ERROR] File not found: {file_path}"
 
+    # 같은 내용의 파일에 기록된 요약이 있으면 (다른 프로젝트 포함) 본문 대신 반환
+    if prefer_summary:
+        stored = _lookup_file_summary(file_path)
+        if stored is not None:
+            return (
+                f"{SUMMARY_PREFIX} A summary recorded for this exact file content is returned instead of the "
+                f"file. Call read_file with prefer_summary=false if the full text is needed.\n\n{stored['summary']}"
+            )
+
     try:
         content = p.read_text(encoding="utf-8", errors="ignore")
     except Exception as e:
@@ -66,14 +162,50 @@ def _read_file(file_path: str, max_chars: int = 8000) -> str:
         return content[:max_chars] + "\n\n[TRUNCATED]"
     return content
 
+def _read_file_lines(text: str, start_line: int, end_line: Optional[int], max_chars: int) -> Dict[str, Any]:
+    lines = text.splitlines(keepends=True)
+    total_lines = len(lines)
+    start = max(1, start_line)
+    last = total_lines if end_line is None else min(max(end_line, start), total_lines)
+
+    if start > total_lines:
+        return {"content": "", "next_line": None, "has_more": False, "total_lines": total_lines}
+
+    # max_chars 를 넘지 않는 범위까지만 (최소 한 줄은 반환)
+    chunk: List[str] = []
+    used = 0
+    line_no = start
+    while line_no <= last:
+        line = lines[line_no - 1]
+        if chunk and used + len(line) > max_chars:
+            break
+        chunk.append(line)
+        used += len(line)
+        line_no += 1
+
+    has_more = line_no <= last
+    return {
+        "content": "".join(chunk),
+        "start_line": start,
+        "end_line": line_no - 1,
+        "next_line": line_no if has_more else None,
+        "has_more": has_more,
+        "total_lines": total_lines,
+    }
+
+
 def _read_file_chunk(
     file_path: str,
     offset: int = 0,
     max_chars: int = 8000,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Read a slice of the file starting at `offset` with length `max_chars`.
     Returns both the content slice and the next offset if more content remains.
+    With `start_line` (1-based, inclusive `end_line`), the slice is taken by line numbers
+    instead, e.g. the `# L<n>` markers from `get_file_outline`.
     """
     p = Path(file_path)
 
@@ -105,6 +237,9 @@ def _read_file_chunk(
             "has_more": False,
         }
 
+    if start_line is not None:
+        return _read_file_lines(text, start_line, end_line, max_chars)
+
     total_len = len(text)
 
     if offset >= total_len:
@@ -128,6 +263,160 @@ def _read_file_chunk(
     }
 
 
+def _literal_glob_prefix(pattern: str) -> Path:
+    """Leading path components of ``pattern`` that contain no glob magic."""
+    literal: List[str] = []
+    for part in Path(pattern).parts:
+        if glob.has_magic(part):
+            break
+        literal.append(part)
+    return Path(*literal) if literal else Path()
+
+
+def _expand_read_targets(paths: List[str], max_files: int) -> List[str]:
+    """
+    Expand glob patterns (``*``, ``?``, ``[...]``, recursive ``**``) into concrete file paths,
+    keeping the requested order, dropping duplicates and files under EXCLUDED_DIRS.
+    Plain paths are kept as-is so missing files still produce an error entry.
+    """
+    targets: List[str] = []
+    seen = set()
+
+    for raw in paths:
+        if glob.has_magic(raw):
+            # 제외 규칙은 패턴의 고정 prefix 아래 부분에만 적용 (프로젝트가 env/, build/ 등 아래에 있어도 동작)
+            literal_depth = len(_literal_glob_prefix(raw).parts)
+            matches = sorted(glob.glob(raw, recursive=True))
+            candidates = [
+                m for m in matches
+                if Path(m).is_file()
+                and not any(part in EXCLUDED_DIRS for part in Path(m).parts[literal_depth:])
+            ]
+        else:
+            candidates = [raw]
+
+        for c in candidates:
+            key = str(Path(c).resolve())
+            if key in seen:
+                continue
+            seen.add(key)
+            targets.append(c)
+
+            if len(targets) >= max_files:
+                return targets
+
+    return targets
+
+
+def _lookup_file_summary(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Return the summary recorded for this exact file content (in any project), if any.
+    """
+    p = Path(file_path)
+    if not p.is_file():
+        return None
+    try:
+        return get_content_store().get(file_content_hash(str(p)), SUMMARY_ARTIFACT)
+    except OSError:
+        return None
+
+
+def _read_file_or_summary(file_path: str, max_chars: int, prefer_summaries: bool) -> Dict[str, Any]:
+    if prefer_summaries and Path(file_path).name.lower() != "readme.md":
+        stored = _lookup_file_summary(file_path)
+        if stored is not None:
+            return {"summary": stored["summary"]}
+    return {"content": _read_file(file_path, max_chars, prefer_summary=False)}
+
+
+async def _read_files(
+    paths: List[str],
+    max_total_chars: int = 40000,
+    max_chars_per_file: int = 8000,
+    max_files: int = 50,
+    prefer_summaries: bool = True,
+) -> Dict[str, Any]:
+    """
+    Read many files (or glob patterns) concurrently in a single call.
+    The total character budget is spent in request order; files past the budget are skipped.
+    With prefer_summaries, files whose exact content already has a recorded summary
+    return that summary instead of their content.
+    """
+    targets = _expand_read_targets(paths, max_files=max_files)
+
+    # 파일 읽기는 스레드에서 동시에 수행 (결과 순서는 요청 순서 유지)
+    reads = await asyncio.gather(
+        *(
+            asyncio.to_thread(_read_file_or_summary, t, max_chars_per_file, prefer_summaries)
+            for t in targets
+        )
+    )
+
+    files: List[Dict[str, Any]] = []
+    remaining = max_total_chars
+
+    for target, read in zip(targets, reads):
+        content = read.get("summary", read.get("content", ""))
+        if "content" in read:
+            if content.startswith("[SKIPPED]"):
+                files.append({"path": target, "skipped": True, "message": content[len("[SKIPPED] "):]})
+                continue
+            if content.startswith("[ERROR]"):
+                files.append({"path": target, "error": content[len("[ERROR] "):]})
+                continue
+
+        # 요약도 본문과 같은 전체 글자 예산을 사용
+        if remaining <= 0:
+            files.append({
+                "path": target,
+                "skipped": True,
+                "message": "Total character budget exhausted; read this file in a later call.",
+            })
+            continue
+
+        truncated = "content" in read and content.endswith("\n\n[TRUNCATED]")
+        if len(content) > remaining:
+            content = content[:remaining] + "\n\n[TRUNCATED]"
+            truncated = True
+
+        remaining -= len(content)
+        if "summary" in read:
+            files.append({"path": target, "summary": content, "from_summary_cache": True, "truncated": truncated})
+        else:
+            files.append({"path": target, "content": content, "truncated": truncated})
+
+    return {
+        "files": files,
+        "files_read": sum(1 for f in files if "content" in f),
+        "summaries_reused": sum(1 for f in files if "summary" in f),
+        "remaining_chars": max(remaining, 0),
+        "budget_exhausted": remaining <= 0,
+    }
+
+
+def _record_file_summary(file_path: str, summary: str) -> Dict[str, Any]:
+    """
+    Store a short analysis summary for a file, keyed by its content hash so every
+    project containing a byte-identical copy can reuse it.
+    """
+    p = Path(file_path)
+
+    if not p.is_file():
+        return {"error": f"File not found: {file_path}"}
+
+    try:
+        digest = file_content_hash(str(p))
+        get_content_store().put(
+            digest,
+            SUMMARY_ARTIFACT,
+            {"summary": summary, "file_name": p.name, "recorded_at": time.time()},
+        )
+    except OSError as e:
+        return {"error": f"Failed to store summary for {file_path}: {e}"}
+
+    return {"stored": True, "path": str(p), "content_hash": digest}
+
+
 async def _record_notes(ctx: Context, notes: str, notes_title: str = "project_overview") -> str:
     async with ctx.store.edit_state() as ctx_state:
         state = ctx_state["state"]
@@ -149,7 +438,9 @@ get_directory_structure = FunctionTool.from_defaults(
     name="get_directory_structure",
     description=(
         "Recursively scan the given directory and return the full folder/file structure, "
-        "excluding unnecessary system/cache folders such as '__pycache__', '.git', '.venv', etc.\n\n"
+        "excluding unnecessary system/cache folders such as '__pycache__', '.git', '.venv', etc. "
+        "Inside a git repository only tracked files are listed (read from the git index), so "
+        "untracked build output and ignored files never appear.\n\n"
         "For each directory, the tool returns:\n"
         "  - 'path': the directory path\n"
         "  - 'dirs': a list of child directory structures (same schema)\n"
@@ -158,7 +449,9 @@ get_directory_structure = FunctionTool.from_defaults(
         "The 'file_paths' field is intended to make it easy for the FileViewerAgent to call "
         "`read_file(file_path=...)` on every discovered file, if desired.\n\n"
         "Args:\n"
-        "  root_path (str): The directory path to scan.\n\n"
+        "  root_path (str): The directory path to scan.\n"
+        "  exclude (list[str], optional): Directories to leave out of the listing (absolute, or "
+        "relative to root_path), e.g. sub-projects analyzed separately.\n\n"
         "Returns:\n"
         "  dict: A JSON-like mapping containing directories, local file names, and full file paths.\n"
     ),
@@ -178,11 +471,16 @@ read_file = FunctionTool.from_defaults(
         "understanding dependency patterns, or extracting execution flows from code.\n\n"
         "If the file is very large, the text will be truncated to avoid overwhelming the LLM. "
         "The truncated indicator `[TRUNCATED]` will be appended so the agent knows additional content exists.\n\n"
+        "If a summary was already recorded (record_file_summary) for a file with exactly the same content, "
+        "in this or any other project, that summary is returned with a `[SUMMARY]` marker instead of the file.\n\n"
         "Args:\n"
         "  file_path (str): Path to the file to read.\n"
-        "  max_chars (int, optional): Maximum characters to return. Defaults to 8000.\n\n"
+        "  max_chars (int, optional): Maximum characters to return. Defaults to 8000.\n"
+        "  prefer_summary (bool, optional): Return a recorded summary when available. Defaults to True; "
+        "pass False to force reading the full text.\n\n"
         "Returns:\n"
-        "  str: The text content of the file, a skip message for README.md, or an error message if reading fails.\n"
+        "  str: The text content of the file (or its recorded summary), a skip message for README.md, "
+        "or an error message if reading fails.\n"
     ),
 )
 
@@ -191,7 +489,8 @@ read_file_chunk = FunctionTool.from_defaults(
     fn=_read_file_chunk,
     name="read_file_chunk",
     description=(
-        "Read a chunk of a file starting from a given character offset, up to `max_chars` characters.\n\n"
+        "Read a chunk of a file starting from a given character offset, up to `max_chars` characters, "
+        "or a range of lines when `start_line` is given.\n\n"
         "This tool is designed for large files that exceed the size limit of a single LLM context. "
         "Instead of truncating the file, the agent can call this tool multiple times with increasing "
         "`offset` values until all relevant parts of the file have been processed.\n\n"
@@ -199,17 +498,68 @@ read_file_chunk = FunctionTool.from_defaults(
         "  - 'content': the text slice read from the file\n"
         "  - 'next_offset': the next offset to use for reading the subsequent chunk (or null if no more data)\n"
         "  - 'has_more': a boolean flag indicating whether more content is available\n"
-        "  - 'length': the total length of the file in characters\n\n"
+        "  - 'length': the total length of the file in characters\n"
+        "In line mode ('start_line' set) it returns 'content', 'start_line', 'end_line', 'next_line', "
+        "'has_more' and 'total_lines' instead, so `# L<n>` line numbers from `get_file_outline` can be "
+        "read directly.\n\n"
         "Args:\n"
         "  file_path (str): Path to the file to read.\n"
         "  offset (int, optional): Character offset from which to start reading. Defaults to 0.\n"
-        "  max_chars (int, optional): Maximum number of characters to read in this chunk. Defaults to 8000.\n\n"
+        "  max_chars (int, optional): Maximum number of characters to read in this chunk. Defaults to 8000.\n"
+        "  start_line (int, optional): 1-based first line to read; switches to line mode.\n"
+        "  end_line (int, optional): Last line to read (inclusive). Defaults to the end of the file, "
+        "still capped by `max_chars`.\n\n"
         "Returns:\n"
         "  dict: A JSON-like object containing the 'content' slice and pagination info.\n"
     ),
 )
 
 
+read_files = FunctionTool.from_defaults(
+    fn=_read_files,
+    name="read_files",
+    description=(
+        "Read many files in ONE call instead of calling `read_file` repeatedly. "
+        "Accepts explicit file paths and/or glob patterns (e.g. '/proj/src/**/*.py'), reads them "
+        "concurrently, and returns their contents in request order.\n\n"
+        "README.md is skipped, and files inside excluded folders such as '.git', '.venv' or "
+        "'node_modules' are ignored when expanding globs. Each file is capped at `max_chars_per_file` "
+        "and the whole response at `max_total_chars`; capped files end with `[TRUNCATED]` and files "
+        "beyond the total budget are returned as skipped entries so they can be requested later.\n\n"
+        "Args:\n"
+        "  paths (list[str]): File paths or glob patterns to read.\n"
+        "  max_total_chars (int, optional): Total character budget for all files. Defaults to 40000.\n"
+        "  max_chars_per_file (int, optional): Maximum characters per file. Defaults to 8000.\n"
+        "  max_files (int, optional): Maximum number of files after glob expansion. Defaults to 50.\n"
+        "  prefer_summaries (bool, optional): Return a previously recorded summary (see "
+        "`record_file_summary`) instead of the content for files whose exact content was already "
+        "analyzed, in this or any other project. Defaults to True.\n\n"
+        "Returns:\n"
+        "  dict: 'files' (list of {'path', 'content', 'truncated'}, {'path', 'summary', "
+        "'from_summary_cache'}, {'path', 'skipped', 'message'} or {'path', 'error'}), 'files_read', "
+        "'summaries_reused', 'remaining_chars' and 'budget_exhausted'.\n"
+    ),
+)
+
+
+record_file_summary = FunctionTool.from_defaults(
+    fn=_record_file_summary,
+    name="record_file_summary",
+    description=(
+        "Store a concise analysis summary (purpose, key classes/functions, notable behavior) for a "
+        "single file. Summaries are keyed by the file's content hash in a store shared across "
+        "projects, so byte-identical files (vendored libraries, shared config, boilerplate) are "
+        "served from this summary by `read_files` instead of being read and analyzed again.\n\n"
+        "Record summaries for files that are likely to be shared or that were expensive to analyze.\n\n"
+        "Args:\n"
+        "  file_path (str): Path to the analyzed file.\n"
+        "  summary (str): The summary text to store.\n\n"
+        "Returns:\n"
+        "  dict: 'stored', 'path' and 'content_hash', or an error message.\n"
+    ),
+)
+
+
 record_notes = FunctionTool.from_defaults(
     fn=_record_notes,
     name="record_notes",
@@ -7,8 +7,9 @@ can call them over the MCP protocol.
 import json
 import os
 import sys
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from mcp.server.fastmcp import FastMCP
 
@@ -24,7 +25,10 @@ from tools.file_viewer_tools import (
     _get_directory_structure as get_directory_structure_impl,
     _read_file as read_file_impl,
     _read_file_chunk as read_file_chunk_impl,
+    _read_files as read_files_impl,
+    _record_file_summary as record_file_summary_impl,
 )
+from tools.file_outline_tool import _get_file_outline as get_file_outline_impl
 from tools.review_readme_tool import _review_readme as review_readme_impl
 from tools.search_web_tool import _search_web as search_web_impl
 from utils.mcp_runtime import read_runtime_config
@@ -34,6 +38,8 @@ mcp = FastMCP("readme-agent-tools", host="localhost")
 LOGS_DIR = PROJECT_ROOT / "logs"
 NOTES_STORE_PATH = LOGS_DIR / "mcp_notes.json"
 NOTES_CACHE: Dict[str, Dict[str, Any]] = {}
+# sync 도구는 스레드에서 동시에 실행될 수 있음 (in-process transport)
+NOTES_LOCK = threading.Lock()
 
 
 def _load_notes_from_disk() -> None:
@@ -74,11 +80,12 @@ _load_notes_from_disk()
     title="Inspect Directory Structure",
     description=(
         "Recursively scan a directory (skipping temporary/cache folders) "
-        "and return the nested folder/file layout."
+        "and return the nested folder/file layout. Git repositories list tracked files only. "
+        "Directories listed in exclude (absolute or relative to path) are left out."
     ),
 )
-def get_directory_structure(path: str) -> Dict[str, Any]:
-    return get_directory_structure_impl(path)
+def get_directory_structure(path: str, exclude: Optional[List[str]] = None) -> Dict[str, Any]:
+    return get_directory_structure_impl(path, exclude=exclude)
 
 
 @mcp.tool(
@@ -86,23 +93,87 @@ def get_directory_structure(path: str) -> Dict[str, Any]:
     title="Read File",
     description=(
         "Read up to max_chars from the target file (README.md is skipped). "
-        "Returns UTF-8 text or an error message."
+        "Returns UTF-8 text or an error message. If a summary was recorded for a file with the same "
+        "content (any project), it is returned with a [SUMMARY] marker unless prefer_summary is false."
     ),
 )
-def read_file(file_path: str, max_chars: int = 8000) -> str:
-    return read_file_impl(file_path=file_path, max_chars=max_chars)
+def read_file(file_path: str, max_chars: int = 8000, prefer_summary: bool = True) -> str:
+    return read_file_impl(file_path=file_path, max_chars=max_chars, prefer_summary=prefer_summary)
 
 
 @mcp.tool(
     name="read_file_chunk",
     title="Read File Chunk",
     description=(
-        "Read a slice of a large file by passing an offset and max_chars. "
+        "Read a slice of a large file by passing an offset and max_chars, or a line range with "
+        "start_line/end_line (1-based, e.g. the # L<n> markers of get_file_outline). "
         "Returns the content chunk plus pagination metadata."
     ),
 )
-def read_file_chunk(file_path: str, offset: int = 0, max_chars: int = 8000) -> Dict[str, Any]:
-    return read_file_chunk_impl(file_path=file_path, offset=offset, max_chars=max_chars)
+def read_file_chunk(
+    file_path: str,
+    offset: int = 0,
+    max_chars: int = 8000,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+) -> Dict[str, Any]:
+    return read_file_chunk_impl(
+        file_path=file_path,
+        offset=offset,
+        max_chars=max_chars,
+        start_line=start_line,
+        end_line=end_line,
+    )
+
+
+@mcp.tool(
+    name="read_files",
+    title="Read Multiple Files",
+    description=(
+        "Read many files or glob patterns concurrently in one call, within a total character budget. "
+        "Returns per-file contents with [TRUNCATED] markers plus skipped/error entries. "
+        "Files with a recorded content-hash summary return the summary instead (prefer_summaries)."
+    ),
+)
+async def read_files(
+    paths: List[str],
+    max_total_chars: int = 40000,
+    max_chars_per_file: int = 8000,
+    max_files: int = 50,
+    prefer_summaries: bool = True,
+) -> Dict[str, Any]:
+    return await read_files_impl(
+        paths=paths,
+        max_total_chars=max_total_chars,
+        max_chars_per_file=max_chars_per_file,
+        max_files=max_files,
+        prefer_summaries=prefer_summaries,
+    )
+
+
+@mcp.tool(
+    name="record_file_summary",
+    title="Record File Summary",
+    description=(
+        "Store a short analysis summary for one file, keyed by its content hash in a store shared "
+        "across projects, so identical files elsewhere reuse it instead of being re-read."
+    ),
+)
+def record_file_summary(file_path: str, summary: str) -> Dict[str, Any]:
+    return record_file_summary_impl(file_path=file_path, summary=summary)
+
+
+@mcp.tool(
+    name="get_file_outline",
+    title="Get File Outline",
+    description=(
+        "Return a compact skeleton of a large source file (AST-based for Python: classes, "
+        "signatures, decorators, first docstring lines; heuristic for other languages). "
+        "Cached by file content hash."
+    ),
+)
+def get_file_outline(file_path: str, max_lines: int = 300) -> Dict[str, Any]:
+    return get_file_outline_impl(file_path=file_path, max_lines=max_lines)
 
 
 @mcp.tool(
@@ -120,15 +191,17 @@ def record_notes(
     persist: bool = True,
 ) -> Dict[str, Any]:
     base = _resolve_project_root(project_root)
-    NOTES_CACHE[notes_title] = {"notes": notes, "project_root": str(base)}
+    with NOTES_LOCK:
+        NOTES_CACHE[notes_title] = {"notes": notes, "project_root": str(base)}
+        notes_count = len(NOTES_CACHE)
 
-    if persist:
-        _persist_notes_to_disk()
+        if persist:
+            _persist_notes_to_disk()
 
     return {
         "stored_title": notes_title,
         "project_root": str(base),
-        "notes_count": len(NOTES_CACHE),
+        "notes_count": notes_count,
     }
 
 
@@ -173,7 +246,10 @@ def write_readme(
 @mcp.tool(
     name="search_web",
     title="Search Web (Tavily)",
-    description="Proxy to the Tavily async client for retrieving external technical context.",
+    description=(
+        "Retrieve external technical context via the configured search backend "
+        "(Tavily by default, or an offline local index). Results are cached by normalized query."
+    ),
 )
 async def search_web(query: str, max_results: int = 5) -> Dict[str, Any]:
     return await search_web_impl(query=query, max_results=max_results)
@@ -3,15 +3,26 @@ Helper utilities to fetch MCP-exposed tools for local agents.
 
 This module connects to the ReadmeAgent MCP server, converts the advertised
 tools into LlamaIndex-compatible tool objects, and caches them for reuse.
+
+Two transports are supported (README_AGENT_MCP_TRANSPORT):
+  - "sse" (default): talk to a (possibly remote) MCP server over SSE.
+  - "inprocess": import the FastMCP server from tools/mcp_server.py and call its
+    tool handlers directly, skipping JSON/HTTP serialization entirely.
+
+Tool definitions are fetched once per process. Over SSE, BasicMCPClient still
+opens a new session for every tool call.
 """
 import asyncio
 import os
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from llama_index.core.tools import BaseTool
+from llama_index.core.tools import AsyncBaseTool, BaseTool, FunctionTool, ToolOutput, adapt_to_async_tool
 from llama_index.tools.mcp import BasicMCPClient, McpToolSpec
 
+from utils.mcp_runtime import ACTIVE_PROJECT_ROOT
+
 MCP_SERVER_URL = os.environ.get("README_AGENT_MCP_SERVER_URL", "http://localhost:8000/sse")
+MCP_TRANSPORT = os.environ.get("README_AGENT_MCP_TRANSPORT", "sse").lower()
 
 _tool_cache: Dict[str, BaseTool] = {}
 _client: Optional[BasicMCPClient] = None
@@ -32,11 +43,115 @@ async def _fetch_tools_async() -> Dict[str, BaseTool]:
     return {tool.metadata.name: tool for tool in tool_list}
 
 
+def _make_inprocess_tool(mcp_tool: Any) -> BaseTool:
+    """
+    Bind a FastMCP tool handler as a LlamaIndex tool.
+
+    The handler's own argument model is reused as the tool schema, so names,
+    descriptions and parameters match what the SSE server advertises. Arguments
+    are validated by FastMCP and the raw Python return value is handed back
+    without being converted to MCP content blocks.
+
+    FastMCP calls sync handlers inline, so those run in a worker thread here;
+    otherwise a full-tree scan or file hash would block the agent's event loop.
+    """
+    if mcp_tool.is_async:
+
+        async def _call(**kwargs: Any) -> Any:
+            return await mcp_tool.run(kwargs)
+
+    else:
+
+        async def _in_thread(**handler_kwargs: Any) -> Any:
+            return await asyncio.to_thread(mcp_tool.fn, **handler_kwargs)
+
+        async def _call(**kwargs: Any) -> Any:
+            # 인자 검증은 FastMCP 와 동일한 경로, 실행만 스레드에서
+            return await mcp_tool.fn_metadata.call_fn_with_arg_validation(
+                _in_thread,
+                True,
+                kwargs,
+                {mcp_tool.context_kwarg: None} if mcp_tool.context_kwarg is not None else None,
+            )
+
+    return FunctionTool.from_defaults(
+        async_fn=_call,
+        name=mcp_tool.name,
+        description=mcp_tool.description or "",
+        fn_schema=mcp_tool.fn_metadata.arg_model,
+    )
+
+
+def _load_inprocess_tools() -> Dict[str, BaseTool]:
+    """
+    Import the FastMCP server module and wrap every registered tool.
+
+    FastMCP exposes the registered Tool objects (with their handlers) only through
+    its tool manager; requirements.txt pins the mcp version this was written against.
+    """
+    from tools.mcp_server import mcp
+
+    tool_manager = getattr(mcp, "_tool_manager", None)
+    if tool_manager is None:
+        raise RuntimeError(
+            "Installed mcp package does not expose FastMCP._tool_manager; "
+            "install the version pinned in requirements.txt or use README_AGENT_MCP_TRANSPORT=sse"
+        )
+
+    return {
+        mcp_tool.name: _make_inprocess_tool(mcp_tool)
+        for mcp_tool in tool_manager.list_tools()
+    }
+
+
+class ProjectScopedTool(AsyncBaseTool):
+    """
+    Wrap a tool that takes a ``project_root`` argument so every call made inside a
+    run targets that run's project (ACTIVE_PROJECT_ROOT), whatever the LLM passed.
+    Outside a run the wrapped tool is called unchanged.
+    """
+
+    def __init__(self, tool: BaseTool) -> None:
+        self._tool = tool
+        self._async_tool = adapt_to_async_tool(tool)
+
+    @property
+    def metadata(self):
+        return self._tool.metadata
+
+    def call(self, *args: Any, **kwargs: Any) -> ToolOutput:
+        return self._tool(*args, **self._scoped(kwargs))
+
+    async def acall(self, *args: Any, **kwargs: Any) -> ToolOutput:
+        return await self._async_tool.acall(*args, **self._scoped(kwargs))
+
+    @staticmethod
+    def _scoped(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        project_root = ACTIVE_PROJECT_ROOT.get()
+        if project_root is None:
+            return kwargs
+        return {**kwargs, "project_root": project_root}
+
+
+def _scope_to_project(tool: BaseTool) -> BaseTool:
+    properties = tool.metadata.get_parameters_dict().get("properties", {})
+    return ProjectScopedTool(tool) if "project_root" in properties else tool
+
+
 def _ensure_tools_loaded() -> Dict[str, BaseTool]:
     global _tool_cache
 
     if not _tool_cache:
-        _tool_cache = asyncio.run(_fetch_tools_async())
+        if MCP_TRANSPORT == "inprocess":
+            tools = _load_inprocess_tools()
+        elif MCP_TRANSPORT == "sse":
+            tools = asyncio.run(_fetch_tools_async())
+        else:
+            raise ValueError(
+                f"Unsupported README_AGENT_MCP_TRANSPORT: {MCP_TRANSPORT} (expected 'sse' or 'inprocess')"
+            )
+        # write_readme/record_notes 등은 실행 중인 프로젝트의 project_root 를 명시적으로 받음
+        _tool_cache = {name: _scope_to_project(tool) for name, tool in tools.items()}
 
     return _tool_cache
 
@@ -51,7 +166,8 @@ def get_mcp_tool(name: str) -> BaseTool:
     tools = _ensure_tools_loaded()
 
     if name not in tools:
-        raise KeyError(f"Tool '{name}' not published by MCP server at {MCP_SERVER_URL}")
+        source = "in-process MCP server" if MCP_TRANSPORT == "inprocess" else f"MCP server at {MCP_SERVER_URL}"
+        raise KeyError(f"Tool '{name}' not published by {source}")
 
     return tools[name]
 
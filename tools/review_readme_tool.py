@@ -2,7 +2,7 @@ from typing import Dict, Any
 from llama_index.core.tools import FunctionTool
 from model import load_llm_model
 
-review_tool_llm = load_llm_model(temperature=0.2, top_p=0.4, max_tokens=8192)
+review_tool_llm = load_llm_model(temperature=0.2, top_p=0.4, max_tokens=8192, route="review_readme")
 
 
 async def _review_readme(readme_text: str, file_notes: Dict[str, Any]) -> Dict[str, Any]:
@@ -1,26 +1,294 @@
-from typing import Any, Dict
+"""
+Web search tool with a persistent TTL cache, single-flight coalescing of
+identical in-flight queries, a concurrency limit and pluggable backends.
+
+Backends (README_AGENT_SEARCH_BACKEND):
+  - "tavily" (default): Tavily async client (needs TAVILY_API_KEYS in configs.py).
+  - "local": offline index read from README_AGENT_SEARCH_INDEX (JSON list of
+    {"title", "url", "content"} documents), scored by term overlap.
+"""
+import abc
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 from llama_index.core.tools import FunctionTool
-from tavily import AsyncTavilyClient
-from configs import TAVILY_API_KEYS
 
+BASE_DIR = Path(__file__).resolve().parent.parent
+LOGS_DIR = BASE_DIR / "logs"
+SEARCH_CACHE_PATH = Path(os.environ.get("README_AGENT_SEARCH_CACHE", LOGS_DIR / "search_cache.db"))
+SEARCH_CACHE_TTL = float(os.environ.get("README_AGENT_SEARCH_CACHE_TTL", 7 * 24 * 3600))
+SEARCH_MAX_CONCURRENCY = int(os.environ.get("README_AGENT_SEARCH_MAX_CONCURRENCY", 4))
+SEARCH_BACKEND = os.environ.get("README_AGENT_SEARCH_BACKEND", "tavily").lower()
+SEARCH_INDEX_PATH = os.environ.get("README_AGENT_SEARCH_INDEX", str(LOGS_DIR / "search_index.json"))
 
-# Tavily 비동기 클라이언트 초기화
-_tavily_client = AsyncTavilyClient(api_key=TAVILY_API_KEYS)
 
+# ==============================================================================================================
+# Backends
+# ==============================================================================================================
+class SearchBackend(abc.ABC):
+    """
+    Interface for search providers. Results should follow Tavily's shape:
+    {"query", "answer", "results": [{"title", "url", "content", "score"}]}.
+    """
 
-async def _search_web(query: str, max_results: int = 5) -> Dict[str, Any]:
-    try:
-        result = await _tavily_client.search(
+    name = "base"
+
+    @abc.abstractmethod
+    async def search(self, query: str, max_results: int = 5) -> Dict[str, Any]:
+        ...
+
+
+class TavilySearchBackend(SearchBackend):
+    name = "tavily"
+
+    def __init__(self, api_key: Optional[str] = None):
+        from tavily import AsyncTavilyClient
+
+        if api_key is None:
+            from configs import TAVILY_API_KEYS
+
+            api_key = TAVILY_API_KEYS
+
+        # Tavily 비동기 클라이언트 초기화
+        self._client = AsyncTavilyClient(api_key=api_key)
+
+    async def search(self, query: str, max_results: int = 5) -> Dict[str, Any]:
+        return await self._client.search(
             query=query,
             max_results=max_results,
             include_answer=True,
             include_raw_content=False,
         )
-        return result
+
+
+class LocalIndexSearchBackend(SearchBackend):
+    """
+    Offline stand-in backend: ranks documents from a local JSON index by term overlap.
+    """
+
+    name = "local"
+
+    def __init__(self, index_path: str = SEARCH_INDEX_PATH):
+        self._index_path = Path(index_path)
+        self._documents: Optional[List[Dict[str, Any]]] = None
+
+    def _load(self) -> List[Dict[str, Any]]:
+        if self._documents is None:
+            if self._index_path.exists():
+                try:
+                    docs = json.loads(self._index_path.read_text(encoding="utf-8"))
+                except json.JSONDecodeError:
+                    docs = []
+            else:
+                docs = []
+            self._documents = [
+                dict(doc, _terms=set(_tokenize(f"{doc.get('title', '')} {doc.get('content', '')}")))
+                for doc in docs
+                if isinstance(doc, dict)
+            ]
+        return self._documents
+
+    async def search(self, query: str, max_results: int = 5) -> Dict[str, Any]:
+        terms = set(_tokenize(query))
+        scored: List[Tuple[float, Dict[str, Any]]] = []
+
+        for doc in self._load():
+            if not terms:
+                break
+            overlap = len(terms & doc["_terms"])
+            if overlap:
+                scored.append((overlap / len(terms), doc))
+
+        scored.sort(key=lambda item: item[0], reverse=True)
+        results = [
+            {
+                "title": doc.get("title", ""),
+                "url": doc.get("url", ""),
+                "content": doc.get("content", "")[:1000],
+                "score": round(score, 3),
+            }
+            for score, doc in scored[:max_results]
+        ]
+        return {
+            "query": query,
+            "answer": results[0]["content"] if results else None,
+            "results": results,
+        }
+
+
+_BACKENDS = {
+    "tavily": TavilySearchBackend,
+    "local": LocalIndexSearchBackend,
+}
+
+
+def _tokenize(text: str) -> List[str]:
+    return re.findall(r"[\w\-\.]+", text.lower())
+
+
+def normalize_query(query: str) -> str:
+    """
+    Lower-case and collapse whitespace so trivially different queries share a cache entry.
+    """
+    return " ".join(query.lower().split())
+
+
+# ==============================================================================================================
+# Cache + single-flight
+# ==============================================================================================================
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_cache (
+    key TEXT PRIMARY KEY,
+    stored_at REAL NOT NULL,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS search_cache_stored_at ON search_cache (stored_at);
+"""
+
+
+class SearchCache:
+    """
+    SQLite backed TTL cache keyed by "<backend>|<max_results>|<normalized query>".
+    Each entry is its own row, so processes sharing the file (server workers, batch
+    workers) insert without rewriting or overwriting each other's entries.
+    """
+
+    def __init__(self, path: Path = SEARCH_CACHE_PATH, ttl: float = SEARCH_CACHE_TTL, busy_timeout_s: float = 5.0):
+        self._path = Path(path)
+        self._ttl = ttl
+        self._busy_timeout_s = busy_timeout_s
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        # 호출마다 새 연결 (스레드/프로세스 간 공유하지 않음)
+        if not self._initialized:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self._path), timeout=self._busy_timeout_s, isolation_level=None)
+        if not self._initialized:
+            conn.executescript(_CACHE_SCHEMA)
+            self._initialized = True
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT result FROM search_cache WHERE key = ? AND stored_at >= ?",
+                (key, time.time() - self._ttl),
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        now = time.time()
+        conn = self._connect()
+        try:
+            # autocommit: 두 문장은 각각 원자적으로 반영됨 (만료 정리는 실패해도 무방)
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, stored_at, result) VALUES (?, ?, ?)",
+                (key, now, json.dumps(result, ensure_ascii=False)),
+            )
+            conn.execute("DELETE FROM search_cache WHERE stored_at < ?", (now - self._ttl,))
+        finally:
+            conn.close()
+
+
+class SearchService:
+    def __init__(
+        self,
+        backend: SearchBackend,
+        cache: Optional[SearchCache] = None,
+        max_concurrency: int = SEARCH_MAX_CONCURRENCY,
+    ):
+        self.backend = backend
+        self.cache = cache if cache is not None else SearchCache()
+        self._max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+
+    async def search(self, query: str, max_results: int = 5) -> Dict[str, Any]:
+        key = f"{self.backend.name}|{max_results}|{normalize_query(query)}"
+
+        cached = await self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        # 동일 쿼리가 이미 진행 중이면 그 결과를 함께 기다림
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # 선행 요청만 취소된 경우에는 직접 다시 조회
+                if not inflight.cancelled():
+                    raise
+                return await self.search(query, max_results=max_results)
+
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            if self._semaphore is None:
+                self._semaphore = asyncio.Semaphore(self._max_concurrency)
+            async with self._semaphore:
+                result = await self.backend.search(query, max_results=max_results)
+            await self._cache_set(key, result)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없을 때 "exception never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    # sqlite 호출은 (busy timeout 동안) 블로킹되므로 스레드에서 실행
+    # 캐시 오류는 검색 실패로 이어지지 않음: 조회 실패 = miss, 저장 실패 = 저장 생략
+    async def _cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await asyncio.to_thread(self.cache.get, key)
+        except (sqlite3.Error, OSError, ValueError):
+            return None
+
+    async def _cache_set(self, key: str, result: Dict[str, Any]) -> None:
+        try:
+            await asyncio.to_thread(self.cache.set, key, result)
+        except (sqlite3.Error, OSError, ValueError):
+            pass
+
+
+_search_service: Optional[SearchService] = None
+
+
+def get_search_service() -> SearchService:
+    global _search_service
+
+    if _search_service is None:
+        if SEARCH_BACKEND not in _BACKENDS:
+            raise ValueError(
+                f"Unsupported README_AGENT_SEARCH_BACKEND: {SEARCH_BACKEND} (expected one of {sorted(_BACKENDS)})"
+            )
+        _search_service = SearchService(_BACKENDS[SEARCH_BACKEND]())
+
+    return _search_service
+
+
+async def _search_web(query: str, max_results: int = 5) -> Dict[str, Any]:
+    try:
+        return await get_search_service().search(query, max_results=max_results)
 
     except Exception as e:
         return {
-            "error": f"Failed to query Tavily API: {e}"
+            "error": f"Failed to query {SEARCH_BACKEND} search backend: {e}"
         }
 
 
@@ -36,6 +304,8 @@ search_web = FunctionTool.from_defaults(
         "Use this when the locally available project context is insufficient and you need "
         "concise background details about frameworks, libraries, or best practices to "
         "enrich README content.\n\n"
+        "Results are cached by normalized query, so repeating a query is cheap. An offline "
+        "local index can stand in for Tavily (README_AGENT_SEARCH_BACKEND=local).\n\n"
         "The result typically includes:\n"
         "  - 'answer': A concise natural-language summary generated by Tavily\n"
         "  - 'results': A list of search hits containing titles, URLs, and snippet summaries\n\n"
@@ -0,0 +1,341 @@
+"""
+Per-run budgets for the README workflow.
+
+A BudgetController is sized from the project (file count and bytes) and made
+active for one workflow attempt through a ContextVar. Agent tools are wrapped in
+BudgetedTool, which
+  - short-circuits repeated identical read-only calls from a per-run cache
+    (a call whose observation was compacted out of the scratchpad may be
+    repeated once without counting as a repeat),
+  - counts exploration tool calls and observation tokens per agent,
+  - refuses further exploration once a budget is spent (including too many
+    repeated calls answered from the cache); the agent then hands off or
+    finishes (see agents.compacting_agent).
+"""
+import json
+import os
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from llama_index.core.tools import AsyncBaseTool, BaseTool, ToolOutput, adapt_to_async_tool
+
+from tools.file_viewer_tools import excluded_rel_paths, in_skipped_dir, is_skipped_dir
+from utils.git_index import tracked_files
+from utils.profiling import ACTIVE_PROFILER
+
+# 결과가 입력에만 의존하는 읽기 전용 도구 → 같은 호출은 캐시에서 반환
+CACHEABLE_TOOLS = {
+    "get_directory_structure",
+    "read_file",
+    "read_file_chunk",
+    "read_files",
+    "get_file_outline",
+    "search_web",
+}
+
+# 예산과 무관하게 항상 허용 (결과 저장/작성 도구)
+# review_readme 는 예산 대상 → Write/Review 반복 루프가 예산 소진 시 종료됨
+ALWAYS_ALLOWED_TOOLS = {"record_notes", "record_file_summary", "write_readme"}
+
+_PATH_ARGS = {"file_path", "path", "root_path"}
+
+# 대략적인 토큰 추정치 (문자 4개 ≈ 토큰 1개)
+CHARS_PER_TOKEN = 4
+
+# 캐시로 응답한 반복 호출도 워크플로우 iteration 을 소모하므로 에이전트별 상한을 둠
+MAX_REPEATED_CALLS = 3
+
+ACTIVE_BUDGET: ContextVar[Optional["BudgetController"]] = ContextVar("readme_agent_budget", default=None)
+
+
+@dataclass
+class AgentBudget:
+    max_tool_calls: int
+    max_observation_tokens: int
+
+
+@dataclass
+class AgentUsage:
+    tool_calls: int = 0
+    cache_hits: int = 0
+    refused_calls: int = 0
+    observation_tokens: int = 0
+
+
+# (파일 수 상한, 워크플로우 max_iterations, 에이전트별 예산)
+_SIZE_TIERS: List[Tuple[str, int, int, Dict[str, AgentBudget]]] = [
+    (
+        "small",
+        30,
+        30,
+        {
+            "FileViewerAgent": AgentBudget(max_tool_calls=12, max_observation_tokens=30_000),
+            "ShardViewerAgent": AgentBudget(max_tool_calls=12, max_observation_tokens=30_000),
+            "WriteAgent": AgentBudget(max_tool_calls=4, max_observation_tokens=8_000),
+            "ReviewAgent": AgentBudget(max_tool_calls=3, max_observation_tokens=8_000),
+        },
+    ),
+    (
+        "medium",
+        200,
+        50,
+        {
+            "FileViewerAgent": AgentBudget(max_tool_calls=25, max_observation_tokens=80_000),
+            "ShardViewerAgent": AgentBudget(max_tool_calls=25, max_observation_tokens=80_000),
+            "WriteAgent": AgentBudget(max_tool_calls=6, max_observation_tokens=12_000),
+            "ReviewAgent": AgentBudget(max_tool_calls=4, max_observation_tokens=12_000),
+        },
+    ),
+    (
+        "large",
+        -1,
+        90,
+        {
+            "FileViewerAgent": AgentBudget(max_tool_calls=50, max_observation_tokens=160_000),
+            "ShardViewerAgent": AgentBudget(max_tool_calls=50, max_observation_tokens=160_000),
+            "WriteAgent": AgentBudget(max_tool_calls=8, max_observation_tokens=16_000),
+            "ReviewAgent": AgentBudget(max_tool_calls=6, max_observation_tokens=16_000),
+        },
+    ),
+]
+_DEFAULT_AGENT_BUDGET = AgentBudget(max_tool_calls=10, max_observation_tokens=20_000)
+
+
+def measure_project(project_root: str, exclude: Optional[List[str]] = None) -> Tuple[int, int]:
+    """
+    Return (file_count, total_bytes) for the project, skipping EXCLUDED_DIRS, hidden dirs and
+    the directories in ``exclude``. Git repositories are measured from the index (tracked files only).
+    """
+    file_count = 0
+    total_bytes = 0
+    root = Path(project_root).resolve()
+    excluded = excluded_rel_paths(root, exclude)
+
+    tracked = tracked_files(project_root)
+    if tracked is not None:
+        for rel_path, entry in tracked:
+            if in_skipped_dir(rel_path):
+                continue
+            if excluded and any(rel_path.startswith(e + "/") for e in excluded):
+                continue
+            file_count += 1
+            total_bytes += entry.size
+        return file_count, total_bytes
+
+    excluded_abs = {str(root.joinpath(*e.split("/"))) for e in excluded}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [
+            d
+            for d in dirnames
+            if not is_skipped_dir(d) and os.path.join(dirpath, d) not in excluded_abs
+        ]
+        for name in filenames:
+            file_count += 1
+            try:
+                total_bytes += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+
+    return file_count, total_bytes
+
+
+def _normalize_call_key(tool_name: str, kwargs: Dict[str, Any]) -> str:
+    normalized = {}
+    for key, value in kwargs.items():
+        if key in _PATH_ARGS and isinstance(value, str):
+            value = str(Path(value).expanduser().resolve())
+        normalized[key] = value
+    return tool_name + ":" + json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+
+
+@dataclass
+class BudgetController:
+    tier: str
+    max_iterations: int
+    budgets: Dict[str, AgentBudget]
+    file_count: int = 0
+    total_bytes: int = 0
+    usage: Dict[str, AgentUsage] = field(default_factory=dict)
+    _cache: Dict[str, ToolOutput] = field(default_factory=dict, repr=False)
+    # 관찰 결과가 scratchpad 에서 압축된 호출 → 한 번은 경고 없이 다시 반환
+    _compacted: Set[str] = field(default_factory=set, repr=False)
+
+    @classmethod
+    def for_project(cls, project_root: str, exclude: Optional[List[str]] = None) -> "BudgetController":
+        file_count, total_bytes = measure_project(project_root, exclude=exclude)
+
+        for tier, max_files, max_iterations, budgets in _SIZE_TIERS:
+            if max_files < 0 or file_count <= max_files:
+                break
+
+        # 파일 수는 적어도 내용이 큰 프로젝트는 관찰 토큰 예산을 늘려줌
+        token_scale = max(1.0, min(2.0, total_bytes / CHARS_PER_TOKEN / 200_000))
+        scaled = {
+            name: AgentBudget(
+                max_tool_calls=b.max_tool_calls,
+                max_observation_tokens=int(b.max_observation_tokens * token_scale),
+            )
+            for name, b in budgets.items()
+        }
+        return cls(
+            tier=tier,
+            max_iterations=max_iterations,
+            budgets=scaled,
+            file_count=file_count,
+            total_bytes=total_bytes,
+        )
+
+    # ------------------------------------------------------------------
+    def budget_for(self, agent_name: str) -> AgentBudget:
+        return self.budgets.get(agent_name, _DEFAULT_AGENT_BUDGET)
+
+    def usage_for(self, agent_name: str) -> AgentUsage:
+        return self.usage.setdefault(agent_name, AgentUsage())
+
+    def exhausted_reason(self, agent_name: str) -> Optional[str]:
+        budget = self.budget_for(agent_name)
+        usage = self.usage_for(agent_name)
+
+        if usage.tool_calls >= budget.max_tool_calls:
+            return f"tool-call budget ({budget.max_tool_calls} calls)"
+        if usage.observation_tokens >= budget.max_observation_tokens:
+            return f"observation token budget (~{budget.max_observation_tokens} tokens)"
+        if usage.cache_hits > MAX_REPEATED_CALLS:
+            return f"repeated-call limit ({MAX_REPEATED_CALLS} identical calls)"
+        return None
+
+    def cached(self, tool_name: str, kwargs: Dict[str, Any]) -> Optional[ToolOutput]:
+        if tool_name not in CACHEABLE_TOOLS:
+            return None
+        return self._cache.get(_normalize_call_key(tool_name, kwargs))
+
+    def mark_compacted(self, tool_name: str, kwargs: Dict[str, Any]) -> None:
+        if tool_name in CACHEABLE_TOOLS:
+            self._compacted.add(_normalize_call_key(tool_name, kwargs))
+
+    def is_compacted(self, tool_name: str, kwargs: Dict[str, Any]) -> bool:
+        return _normalize_call_key(tool_name, kwargs) in self._compacted
+
+    def pop_compacted(self, tool_name: str, kwargs: Dict[str, Any]) -> bool:
+        key = _normalize_call_key(tool_name, kwargs)
+        if key not in self._compacted:
+            return False
+        self._compacted.discard(key)
+        return True
+
+    def record(self, agent_name: str, tool_name: str, kwargs: Dict[str, Any], output: ToolOutput) -> None:
+        usage = self.usage_for(agent_name)
+        usage.tool_calls += 1
+        usage.observation_tokens += len(str(output.content)) // CHARS_PER_TOKEN
+
+        if tool_name in CACHEABLE_TOOLS and not output.is_error:
+            self._cache[_normalize_call_key(tool_name, kwargs)] = output
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "tier": self.tier,
+            "file_count": self.file_count,
+            "total_bytes": self.total_bytes,
+            "max_iterations": self.max_iterations,
+            "agents": {
+                name: {
+                    "budget": vars(self.budget_for(name)),
+                    "usage": vars(usage),
+                }
+                for name, usage in self.usage.items()
+            },
+        }
+
+
+# ----------------------------------------------------------------------
+def _handoff_hint(agent_name: str) -> str:
+    if agent_name == "FileViewerAgent":
+        return "Call record_notes with your findings now, then hand off to WriteAgent."
+    if agent_name == "WriteAgent":
+        return "Save the README with write_readme if needed, then hand off to ReviewAgent."
+    if agent_name == "ShardViewerAgent":
+        return "Call record_notes with your findings now, then return your shard notes as the final answer."
+    if agent_name == "ReviewAgent":
+        return "Stop reviewing and finish now with your final answer."
+    return "Finish now with your final answer."
+
+
+class BudgetedTool(AsyncBaseTool):
+    """
+    Wrap a tool so calls made by ``agent_name`` go through the active BudgetController.
+    Without an active controller the wrapped tool is called unchanged.
+    """
+
+    def __init__(self, tool: BaseTool, agent_name: str, handoff_hint: Optional[str] = None) -> None:
+        self._tool = tool
+        self._async_tool = adapt_to_async_tool(tool)
+        self._agent_name = agent_name
+        self._handoff_hint = handoff_hint or _handoff_hint(agent_name)
+
+    @property
+    def metadata(self):
+        return self._tool.metadata
+
+    def call(self, *args: Any, **kwargs: Any) -> ToolOutput:
+        return self._tool(*args, **kwargs)
+
+    async def acall(self, *args: Any, **kwargs: Any) -> ToolOutput:
+        profiler = ACTIVE_PROFILER.get()
+        if profiler is None:
+            return await self._budgeted_acall(*args, **kwargs)
+
+        async with profiler.tool_span(self._agent_name, self.metadata.name):
+            return await self._budgeted_acall(*args, **kwargs)
+
+    async def _budgeted_acall(self, *args: Any, **kwargs: Any) -> ToolOutput:
+        controller = ACTIVE_BUDGET.get()
+        if controller is None:
+            return await self._async_tool.acall(*args, **kwargs)
+
+        tool_name = self.metadata.name
+
+        cached = controller.cached(tool_name, kwargs)
+        if cached is not None and not controller.is_compacted(tool_name, kwargs):
+            controller.usage_for(self._agent_name).cache_hits += 1
+
+        if tool_name not in ALWAYS_ALLOWED_TOOLS:
+            reason = controller.exhausted_reason(self._agent_name)
+            if reason is not None:
+                controller.usage_for(self._agent_name).refused_calls += 1
+                message = (
+                    f"[BUDGET EXHAUSTED] {self._agent_name} has used its {reason}. "
+                    f"No further '{tool_name}' calls will be executed. {self._handoff_hint}"
+                )
+                return ToolOutput(
+                    content=message,
+                    tool_name=tool_name,
+                    raw_input={"args": args, "kwargs": kwargs},
+                    raw_output=message,
+                )
+
+        if cached is not None:
+            if controller.pop_compacted(tool_name, kwargs):
+                header = "[CACHED] Full result of an earlier call whose observation was compacted."
+            else:
+                header = (
+                    "[CACHED] This exact call was already made in this run; the earlier result is repeated. "
+                    "Do not repeat identical calls."
+                )
+            return ToolOutput(
+                content=header + "\n\n" + str(cached.content),
+                tool_name=tool_name,
+                raw_input={"args": args, "kwargs": kwargs},
+                raw_output=cached.raw_output,
+            )
+
+        output = await self._async_tool.acall(*args, **kwargs)
+        controller.record(self._agent_name, tool_name, kwargs, output)
+        return output
+
+
+def budgeted_tools(
+    agent_name: str, tools: Iterable[BaseTool], handoff_hint: Optional[str] = None
+) -> List[BaseTool]:
+    return [BudgetedTool(tool, agent_name, handoff_hint=handoff_hint) for tool in tools]
@@ -0,0 +1,173 @@
+"""
+Global on-disk store for per-file analysis artifacts, keyed by file content hash.
+
+Keys are git blob ids ("git-<sha1 of 'blob <size>\\0' + content>"), so files in
+git repositories are keyed straight from the index without being read, and the
+same file hashes identically in git and non-git projects.
+
+Byte-identical files (vendored libraries, shared config, templated boilerplate)
+share one entry across every project analyzed on the machine, so their outline
+and summary notes are computed once.
+
+Layout:  <root>/objects/<hash[-2:]>/<hash>/<kind>.json
+
+- Writes go to a temp file in the same directory followed by os.replace, so
+  concurrent writers in different processes never expose partial files.
+- Reads touch the artifact's mtime; eviction removes least-recently-used
+  artifacts once the store grows beyond its size limit. Only one process evicts
+  at a time (advisory file lock where fcntl is available).
+"""
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from utils.git_index import file_blob_hash, git_blob_hash
+
+CONTENT_STORE_DIR = Path(
+    os.environ.get(
+        "README_AGENT_CONTENT_STORE",
+        Path.home() / ".cache" / "readme_agent" / "content_store",
+    )
+)
+CONTENT_STORE_MAX_BYTES = int(os.environ.get("README_AGENT_CONTENT_STORE_MAX_BYTES", 512 * 1024 * 1024))
+
+# 프로세스당 eviction 검사 최소 간격 (초)
+EVICTION_INTERVAL = 60.0
+
+HASH_PREFIX = "git"
+
+
+def content_hash(data: bytes) -> str:
+    return f"{HASH_PREFIX}-{git_blob_hash(data)}"
+
+
+def file_content_hash(file_path: str) -> str:
+    # git 저장소에서 변경되지 않은 파일은 index 의 blob 해시를 그대로 사용 (파일을 읽지 않음)
+    return f"{HASH_PREFIX}-{file_blob_hash(file_path)}"
+
+
+class ContentStore:
+    def __init__(self, root: Path = CONTENT_STORE_DIR, max_bytes: int = CONTENT_STORE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._objects = self.root / "objects"
+        self._last_eviction_check = 0.0
+
+    def _artifact_path(self, digest: str, kind: str) -> Path:
+        return self._objects / digest[-2:] / digest / f"{kind}.json"
+
+    # ------------------------------------------------------------------
+    def get(self, digest: str, kind: str) -> Optional[Dict[str, Any]]:
+        path = self._artifact_path(digest, kind)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            # 없음/권한 없음/손상된 항목은 모두 cache miss 로 취급
+            return None
+
+        # LRU: 최근 사용 시각을 mtime 으로 기록
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return data
+
+    def put(self, digest: str, kind: str, data: Dict[str, Any]) -> None:
+        path = self._artifact_path(digest, kind)
+
+        # 다른 프로세스의 evict() 가 mkdir 직후 빈 해시 디렉토리를 지울 수 있으므로 한 번 재시도
+        # (temp 파일이 생긴 뒤에는 디렉토리가 비어 있지 않아 rmdir 되지 않음)
+        for attempt in range(2):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{kind}.", suffix=".tmp")
+                break
+            except FileNotFoundError:
+                if attempt:
+                    raise
+
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+        self._maybe_evict()
+
+    # ------------------------------------------------------------------
+    def _maybe_evict(self) -> None:
+        now = time.monotonic()
+        if now - self._last_eviction_check < EVICTION_INTERVAL:
+            return
+        self._last_eviction_check = now
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / ".evict.lock", "a") as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    # 다른 프로세스가 이미 정리 중
+                    return
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Delete least-recently-used artifacts until the store is under 90% of max_bytes.
+        Returns the number of bytes freed.
+        """
+        artifacts: List[Tuple[float, int, Path]] = []
+        total = 0
+
+        for path in self._objects.glob("*/*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            artifacts.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        if total <= self.max_bytes:
+            return 0
+
+        target = int(self.max_bytes * 0.9)
+        freed = 0
+        for _, size, path in sorted(artifacts):
+            if total - freed <= target:
+                break
+            try:
+                path.unlink()
+                freed += size
+            except OSError:
+                continue
+            try:
+                path.parent.rmdir()  # 비어 있으면 해시 디렉토리도 제거
+            except OSError:
+                pass
+
+        return freed
+
+
+_store: Optional[ContentStore] = None
+
+
+def get_content_store() -> ContentStore:
+    global _store
+
+    if _store is None:
+        _store = ContentStore()
+
+    return _store
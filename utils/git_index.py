@@ -0,0 +1,276 @@
+"""
+Pure-Python reader for the git index (``.git/index``), no git binary required.
+
+Used to enumerate the tracked files of a repository without walking the working
+tree: untracked build output is excluded for free, and every entry carries the
+blob SHA-1 and size git recorded for it. Supports index versions 2, 3 and 4
+(path prefix compression), linked worktrees / submodules whose ``.git`` is a
+``gitdir:`` file, and recurses into checked-out submodules.
+
+Blob hashes double as content keys (``git_blob_hash``): a file whose stat still
+matches its index entry is identified without reading it.
+"""
+import hashlib
+import os
+import struct
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+_HEADER = struct.Struct(">4sLL")
+# ctime s/ns(skip), mtime s/ns, dev/ino(skip), mode, uid/gid(skip), size, sha1, flags
+_ENTRY = struct.Struct(">8xLL8xL8xL20sH")
+
+_FLAG_EXTENDED = 0x4000
+_FLAG_STAGE_MASK = 0x3000
+_NAME_MASK = 0x0FFF
+_EXT_FLAG_SKIP_WORKTREE = 0x4000
+
+_MODE_TYPE_MASK = 0o170000
+_MODE_GITLINK = 0o160000
+_MODE_DIRECTORY = 0o040000  # sparse-index directory entry
+
+_READ_BLOCK = 1024 * 1024
+
+
+# 대형 저장소(수십만 엔트리)에서 파싱 비용을 줄이기 위해 NamedTuple 사용
+class IndexEntry(NamedTuple):
+    path: str  # worktree 기준 상대 경로 (posix)
+    sha1_bytes: bytes
+    size: int
+    mode: int
+    mtime_s: int
+    mtime_ns: int
+
+    @property
+    def sha1(self) -> str:
+        return self.sha1_bytes.hex()
+
+    @property
+    def is_gitlink(self) -> bool:
+        return self.mode & _MODE_TYPE_MASK == _MODE_GITLINK
+
+    def matches_stat(self, st: os.stat_result) -> bool:
+        # index 는 크기/시간을 32bit 로 저장
+        return (
+            self.size == st.st_size & 0xFFFFFFFF
+            and self.mtime_s == int(st.st_mtime) & 0xFFFFFFFF
+            and self.mtime_ns == st.st_mtime_ns % 1_000_000_000
+        )
+
+
+class GitIndexError(ValueError):
+    pass
+
+
+# ----------------------------------------------------------------------
+def find_git_dir(path: str) -> Optional[Tuple[Path, Path]]:
+    """
+    Return (worktree_root, git_dir) for the repository containing ``path``, or None.
+    """
+    current = Path(path).resolve()
+    for candidate in (current, *current.parents):
+        dot_git = candidate / ".git"
+        if dot_git.is_dir():
+            return candidate, dot_git
+        if dot_git.is_file():
+            # worktree / submodule: ".git" 파일에 "gitdir: <path>"
+            try:
+                content = dot_git.read_text(encoding="utf-8").strip()
+            except OSError:
+                return None
+            if not content.startswith("gitdir:"):
+                return None
+            git_dir = Path(content[len("gitdir:"):].strip())
+            if not git_dir.is_absolute():
+                git_dir = (candidate / git_dir).resolve()
+            return candidate, git_dir
+    return None
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    # git 의 offset varint (index v4 경로 prefix 압축)
+    c = data[pos]
+    pos += 1
+    value = c & 0x7F
+    while c & 0x80:
+        c = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (c & 0x7F)
+    return value, pos
+
+
+def parse_index(data: bytes) -> List[IndexEntry]:
+    """
+    Parse the raw bytes of an index file into stage-0 entries (in index order).
+    Skip-worktree (sparse checkout) and sparse directory entries are omitted.
+    """
+    if len(data) < _HEADER.size:
+        raise GitIndexError("index file is truncated")
+
+    signature, version, count = _HEADER.unpack_from(data, 0)
+    if signature != b"DIRC":
+        raise GitIndexError("not a git index file")
+    if version not in (2, 3, 4):
+        raise GitIndexError(f"unsupported index version {version}")
+
+    entries: List[IndexEntry] = []
+    append = entries.append
+    pos = _HEADER.size
+    previous_name = b""
+    unpack_entry = _ENTRY.unpack_from
+
+    for _ in range(count):
+        start = pos
+        mtime_s, mtime_ns, mode, size, sha1, flags = unpack_entry(data, pos)
+        pos += _ENTRY.size
+
+        skip_worktree = False
+        if flags & _FLAG_EXTENDED:
+            if version < 3:
+                raise GitIndexError("extended flags in a version 2 index")
+            (ext_flags,) = struct.unpack_from(">H", data, pos)
+            skip_worktree = bool(ext_flags & _EXT_FLAG_SKIP_WORKTREE)
+            pos += 2
+
+        if version == 4:
+            strip, pos = _read_varint(data, pos)
+            end = data.index(b"\0", pos)
+            name = previous_name[: len(previous_name) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            name_len = flags & _NAME_MASK
+            if name_len == _NAME_MASK:  # 4095 자 이상은 NUL 까지
+                end = data.index(b"\0", pos)
+            else:
+                end = pos + name_len
+            name = data[pos:end]
+            # 엔트리 전체 길이가 8의 배수가 되도록 1~8 개의 NUL 패딩
+            pos = start + ((end - start + 8) & ~7)
+        previous_name = name
+
+        if flags & _FLAG_STAGE_MASK or skip_worktree:
+            continue
+        if mode & _MODE_TYPE_MASK == _MODE_DIRECTORY:
+            continue
+
+        append(IndexEntry(name.decode("utf-8", "surrogateescape"), sha1, size, mode, mtime_s, mtime_ns))
+
+    return entries
+
+
+# (index 경로) → (mtime_ns, size, entries, path → entry)
+_INDEX_CACHE: Dict[str, Tuple[int, int, List[IndexEntry], Dict[str, IndexEntry]]] = {}
+
+
+def _load_index(git_dir: Path) -> Optional[Tuple[List[IndexEntry], Dict[str, IndexEntry], int]]:
+    index_path = git_dir / "index"
+    try:
+        st = index_path.stat()
+    except OSError:
+        return None
+
+    key = str(index_path)
+    cached = _INDEX_CACHE.get(key)
+    if cached is None or cached[0] != st.st_mtime_ns or cached[1] != st.st_size:
+        try:
+            entries = parse_index(index_path.read_bytes())
+        except (OSError, GitIndexError, struct.error, IndexError, ValueError):
+            return None
+        cached = (st.st_mtime_ns, st.st_size, entries, {e.path: e for e in entries})
+        _INDEX_CACHE[key] = cached
+
+    return cached[2], cached[3], st.st_mtime_ns
+
+
+def tracked_files(root_path: str) -> Optional[List[Tuple[str, IndexEntry]]]:
+    """
+    Return [(relative_path, entry)] for every tracked file under ``root_path`` (posix
+    paths relative to ``root_path``, index order), including files of checked-out
+    submodules, or None when ``root_path`` is not inside a git repository with a
+    readable index or when no tracked file lies under it (e.g. an untracked
+    directory inside an outer repository). Callers walk the filesystem on None.
+    """
+    root = Path(root_path).resolve()
+    located = find_git_dir(str(root))
+    if located is None:
+        return None
+    worktree, git_dir = located
+
+    loaded = _load_index(git_dir)
+    if loaded is None:
+        return None
+    entries = loaded[0]
+
+    prefix = "" if root == worktree else root.relative_to(worktree).as_posix() + "/"
+    result: List[Tuple[str, IndexEntry]] = []
+
+    skip = len(prefix)
+
+    for entry in entries:
+        if prefix and not entry.path.startswith(prefix):
+            continue
+        rel_path = entry.path[skip:]
+
+        if entry.is_gitlink:
+            sub_root = root.joinpath(*rel_path.split("/"))
+            if (sub_root / ".git").exists():
+                result.extend((f"{rel_path}/{sub_rel}", sub_entry) for sub_rel, sub_entry in tracked_files(str(sub_root)) or [])
+            continue
+        result.append((rel_path, entry))
+
+    return result or None
+
+
+def index_entry_for(file_path: str) -> Optional[IndexEntry]:
+    """
+    Return the index entry for ``file_path`` if its working-tree stat still matches it,
+    i.e. the recorded blob hash is the file's current content hash.
+    """
+    path = Path(file_path).resolve()
+    located = find_git_dir(str(path.parent))
+    if located is None:
+        return None
+    worktree, git_dir = located
+
+    loaded = _load_index(git_dir)
+    if loaded is None:
+        return None
+    _, by_path, index_mtime_ns = loaded
+
+    entry = by_path.get(path.relative_to(worktree).as_posix())
+    if entry is None or entry.is_gitlink:
+        return None
+
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    # index 이후(또는 같은 시각)에 수정된 파일은 stat 이 같아도 내용이 다를 수 있음 (racy git)
+    if st.st_mtime_ns >= index_mtime_ns or not entry.matches_stat(st):
+        return None
+    return entry
+
+
+# ----------------------------------------------------------------------
+def git_blob_hash(data: bytes) -> str:
+    """SHA-1 of ``data`` as git stores it ("blob <size>\\0" + content)."""
+    hasher = hashlib.sha1(b"blob %d\0" % len(data))
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def file_blob_hash(file_path: str) -> str:
+    """
+    Git blob SHA-1 of a file: taken from the index when the file is unchanged since it
+    was staged, computed from its content otherwise.
+    """
+    entry = index_entry_for(file_path)
+    if entry is not None:
+        return entry.sha1
+
+    size = os.path.getsize(file_path)
+    hasher = hashlib.sha1(b"blob %d\0" % size)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_READ_BLOCK), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
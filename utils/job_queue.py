@@ -0,0 +1,234 @@
+"""
+In-process priority job queue for the long-lived README generation service.
+
+Jobs are deduplicated by a key derived from the project (so submitting the same
+project twice while it is queued or running returns the existing job), executed
+by a bounded pool of worker tasks, and keep a replayable event log so clients
+can poll or stream their progress.
+"""
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+ACTIVE_STATUSES = {QUEUED, RUNNING}
+
+# 작업 하나가 보관하는 최대 이벤트 수 (토큰 이벤트가 많아 메모리 폭증 방지)
+MAX_EVENTS_PER_JOB = 5000
+
+JobRunner = Callable[["Job", Callable[[Dict[str, Any]], None]], Awaitable[Any]]
+
+
+def project_job_key(
+    project_root: str,
+    user_requirements: Optional[str] = None,
+    existing_readme_path: str = "README.md",
+    targets: Optional[List[Dict[str, Any]]] = None,
+) -> str:
+    """
+    Hash the inputs that determine a README run so identical submissions share a job.
+    """
+    payload = json.dumps(
+        {
+            "project_root": os.path.abspath(project_root),
+            "user_requirements": user_requirements or "",
+            "existing_readme_path": existing_readme_path,
+            "targets": targets or [],
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Job:
+    job_id: str
+    key: str
+    params: Dict[str, Any]
+    priority: int = 0
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    dropped_events: int = 0
+    _subscribers: List["asyncio.Queue[Optional[Dict[str, Any]]]"] = field(
+        default_factory=list, repr=False
+    )
+
+    @property
+    def done(self) -> bool:
+        return self.status not in ACTIVE_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "key": self.key,
+            "params": self.params,
+            "priority": self.priority,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "event_count": len(self.events) + self.dropped_events,
+        }
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        if len(self.events) < MAX_EVENTS_PER_JOB:
+            self.events.append(event)
+        else:
+            self.dropped_events += 1
+
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    def subscribe(self) -> "asyncio.Queue[Optional[Dict[str, Any]]]":
+        """
+        Return a queue pre-filled with past events that receives live events.
+        A ``None`` sentinel is pushed once the job finishes.
+        """
+        queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+        for event in self.events:
+            queue.put_nowait(event)
+
+        if self.done:
+            queue.put_nowait(None)
+        else:
+            self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: "asyncio.Queue[Optional[Dict[str, Any]]]") -> None:
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def _close_subscribers(self) -> None:
+        for queue in self._subscribers:
+            queue.put_nowait(None)
+        self._subscribers.clear()
+
+
+class JobQueue:
+    """
+    Priority queue (lower number = higher priority) drained by ``max_workers`` tasks.
+    """
+
+    def __init__(self, runner: JobRunner, max_workers: int = 1, max_finished_jobs: int = 500):
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1")
+
+        self._runner = runner
+        self._max_workers = max_workers
+        self._max_finished_jobs = max_finished_jobs
+        self._queue: "asyncio.PriorityQueue[tuple]" = asyncio.PriorityQueue()
+        self._counter = itertools.count()
+        self._jobs: Dict[str, Job] = {}
+        self._active_by_key: Dict[str, str] = {}
+        self._workers: List[asyncio.Task] = []
+
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker_loop(i), name=f"readme-job-worker-{i}")
+            for i in range(self._max_workers)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # ------------------------------------------------------------------
+    def submit(self, key: str, params: Dict[str, Any], priority: int = 0) -> tuple:
+        """
+        Enqueue a job, or return the active job with the same key.
+
+        Returns:
+            (job, deduplicated): deduplicated is True when an existing job was reused.
+        """
+        existing_id = self._active_by_key.get(key)
+        if existing_id is not None:
+            existing = self._jobs[existing_id]
+            # 더 높은 우선순위로 재요청되면 대기 중인 작업의 우선순위를 끌어올림
+            if existing.status == QUEUED and priority < existing.priority:
+                existing.priority = priority
+                self._queue.put_nowait((priority, next(self._counter), existing.job_id))
+            return existing, True
+
+        job = Job(job_id=uuid.uuid4().hex, key=key, params=params, priority=priority)
+        self._jobs[job.job_id] = job
+        self._active_by_key[key] = job.job_id
+        self._queue.put_nowait((priority, next(self._counter), job.job_id))
+        job.publish({"type": "status", "status": QUEUED})
+        return job, False
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        return sorted(self._jobs.values(), key=lambda j: j.created_at)
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"workers": self._max_workers, "queued": self._queue.qsize(), "jobs": counts}
+
+    # ------------------------------------------------------------------
+    async def _worker_loop(self, worker_index: int) -> None:
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                # 우선순위 상향으로 생긴 중복 엔트리는 건너뜀
+                if job is None or job.status != QUEUED:
+                    continue
+                await self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: Job) -> None:
+        job.status = RUNNING
+        job.started_at = time.time()
+        job.publish({"type": "status", "status": RUNNING})
+
+        try:
+            job.result = await self._runner(job, job.publish)
+            job.status = SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = FAILED
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            job.status = FAILED
+            job.error = f"{type(e).__name__}: {e}"
+        finally:
+            job.finished_at = time.time()
+            self._active_by_key.pop(job.key, None)
+            job.publish({"type": "status", "status": job.status, "error": job.error})
+            job._close_subscribers()
+            self._prune_finished()
+
+    def _prune_finished(self) -> None:
+        finished = [j for j in self._jobs.values() if j.done]
+        overflow = len(finished) - self._max_finished_jobs
+        if overflow <= 0:
+            return
+        for job in sorted(finished, key=lambda j: j.finished_at or 0)[:overflow]:
+            self._jobs.pop(job.job_id, None)
@@ -1,7 +1,13 @@
 """
 Utility helpers for sharing runtime metadata with the MCP server.
+
+The project being documented is tracked per run in ``ACTIVE_PROJECT_ROOT``;
+MCP tools that take a ``project_root`` argument receive it explicitly (see
+tools.mcp_tool_registry), so concurrent runs in one process never share it.
+The runtime file is only a default for MCP clients outside the workflow.
 """
 import json
+from contextvars import ContextVar
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -9,6 +15,9 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 LOGS_DIR = BASE_DIR / "logs"
 RUNTIME_PATH = LOGS_DIR / "mcp_runtime.json"
 
+# 현재 실행(워크플로우 attempt)의 project_root — asyncio task 별로 분리됨
+ACTIVE_PROJECT_ROOT: ContextVar[Optional[str]] = ContextVar("readme_agent_project_root", default=None)
+
 
 def write_runtime_config(**entries: Any) -> None:
     """
@@ -0,0 +1,378 @@
+"""
+Built-in profiling for a README run (``python main.py --path ... --profile``).
+
+A RunProfiler is made active for the run through a ContextVar and records
+  - wall-time spans: run → shard/target scope → agent → tool / llm:<tier>,
+  - tracemalloc peak allocation per tool call (approximate when tool calls overlap),
+  - asyncio event-loop lag, sampled by a background task,
+  - optionally a cProfile or pyinstrument profile of the whole run.
+
+On exit it writes under ``log_dir``:
+  profile_<ts>.json       summary report (spans per agent/tool/llm, allocations, loop lag)
+  profile_<ts>.collapsed  flamegraph-compatible collapsed stacks ("run;agent;tool <ms>")
+  profile_<ts>.pstats     (mode "cprofile")  -> python -m pstats / snakeviz
+  profile_<ts>.html       (mode "pyinstrument")
+
+Concurrent shards/targets are recorded under their own scope frame, so their
+times add up in the collapsed file (widths are summed time, not wall time).
+With the default SSE transport MCP tools execute in the server process; their
+span time includes transport overhead, but cProfile/pyinstrument/tracemalloc only
+see the client side. Use README_AGENT_MCP_TRANSPORT=inprocess to profile tool internals.
+"""
+import asyncio
+import cProfile
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:
+    PyinstrumentProfiler = None
+
+PROFILE_MODES = ("spans", "cprofile", "pyinstrument")
+
+ROOT_FRAME = "readme_run"
+
+# 이벤트 루프 지연 샘플링 간격 / stall 로 간주할 지연 (초)
+LOOP_LAG_INTERVAL = 0.05
+LOOP_STALL_THRESHOLD = 0.1
+MAX_RECORDED_STALLS = 20
+
+ACTIVE_PROFILER: ContextVar[Optional["RunProfiler"]] = ContextVar("readme_agent_profiler", default=None)
+_SCOPE: ContextVar[Tuple[str, ...]] = ContextVar("readme_agent_profile_scope", default=())
+
+
+@dataclass
+class Span:
+    kind: str  # scope | agent | tool | llm
+    stack: Tuple[str, ...]
+    start: float
+    duration_s: float
+    alloc_peak_bytes: Optional[int] = None
+
+
+def _frame(name: str) -> str:
+    # collapsed 포맷에서 ';' 는 프레임 구분자
+    return name.replace(";", ":")
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RunProfiler:
+    def __init__(self, mode: str = "spans", log_dir: str = "./logs", trace_allocations: bool = True) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"unknown profile mode {mode!r} (expected one of {PROFILE_MODES})")
+
+        self.mode = mode
+        self.log_dir = log_dir
+        self.trace_allocations = trace_allocations
+        self.spans: List[Span] = []
+        self.loop_lags: List[float] = []
+        self.stalls: List[Dict[str, Any]] = []
+
+        self._started_at = 0.0
+        self._wall_time_s = 0.0
+        self._stopped = False
+        self._open: Dict[int, Tuple[str, ...]] = {}
+        self._open_ids = 0
+        self._current_agent: Dict[Tuple[str, ...], Tuple[str, float]] = {}
+        self._lag_task: Optional[asyncio.Task] = None
+        self._lag_expected: Optional[float] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._pyinstrument = None
+        self._started_tracemalloc = False
+
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        self._started_at = time.perf_counter()
+
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        if self.mode == "cprofile":
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        elif self.mode == "pyinstrument":
+            if PyinstrumentProfiler is None:
+                raise RuntimeError("pyinstrument is not installed (pip install pyinstrument)")
+            self._pyinstrument = PyinstrumentProfiler(async_mode="enabled")
+            self._pyinstrument.start()
+
+        self._lag_task = asyncio.get_running_loop().create_task(self._sample_loop_lag())
+
+    async def stop(self) -> None:
+        if self._lag_task is not None:
+            # 마지막 샘플이 지연된 채로 취소되면 그 stall 이 누락되므로 먼저 기록
+            if self._lag_expected is not None:
+                self._record_lag(asyncio.get_running_loop().time() - self._lag_expected)
+            self._lag_task.cancel()
+            await asyncio.gather(self._lag_task, return_exceptions=True)
+            self._lag_task = None
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._pyinstrument is not None:
+            self._pyinstrument.stop()
+
+        # 끝나지 않은 agent span 정리
+        now = time.perf_counter()
+        for scope in list(self._current_agent):
+            self._close_agent(scope, now)
+
+        self._wall_time_s = now - self._started_at
+        self._stopped = True
+
+    async def _sample_loop_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._lag_expected = loop.time() + LOOP_LAG_INTERVAL
+            await asyncio.sleep(LOOP_LAG_INTERVAL)
+            self._record_lag(loop.time() - self._lag_expected)
+
+    def _record_lag(self, lag: float) -> None:
+        if lag < 0:
+            return
+        self.loop_lags.append(lag)
+
+        if lag >= LOOP_STALL_THRESHOLD and len(self.stalls) < MAX_RECORDED_STALLS:
+            self.stalls.append(
+                {
+                    "at_s": round(time.perf_counter() - self._started_at, 3),
+                    "lag_ms": round(lag * 1000, 1),
+                    # stall 당시 열려 있던 span → 어떤 도구/단계가 루프를 막았는지 추정
+                    "open_spans": [";".join(stack) for stack in self._open.values()],
+                }
+            )
+
+    # ------------------------------------------------------------------
+    def _stack(self, *frames: str) -> Tuple[str, ...]:
+        return (ROOT_FRAME,) + _SCOPE.get() + tuple(_frame(f) for f in frames)
+
+    def _add(self, kind: str, stack: Tuple[str, ...], start: float, end: float, alloc: Optional[int] = None) -> None:
+        self.spans.append(Span(kind, stack, start - self._started_at, end - start, alloc))
+
+    @contextmanager
+    def _opened(self, stack: Tuple[str, ...]) -> Iterator[None]:
+        self._open_ids += 1
+        span_id = self._open_ids
+        self._open[span_id] = stack
+        try:
+            yield
+        finally:
+            self._open.pop(span_id, None)
+
+    @contextmanager
+    def scope(self, name: str) -> Iterator[None]:
+        """Nest everything recorded inside (agents, tools, llm calls) under ``name``."""
+        stack = self._stack(name)
+        token = _SCOPE.set(stack[1:])
+        start = time.perf_counter()
+        try:
+            with self._opened(stack):
+                yield
+        finally:
+            _SCOPE.reset(token)
+            self._add("scope", stack, start, time.perf_counter())
+
+    def agent_switched(self, agent_name: str) -> None:
+        """Called from the workflow event stream whenever the active agent changes."""
+        scope = _SCOPE.get()
+        now = time.perf_counter()
+        self._close_agent(scope, now)
+        self._current_agent[scope] = (agent_name, now)
+
+    def agent_finished(self) -> None:
+        self._close_agent(_SCOPE.get(), time.perf_counter())
+
+    def _close_agent(self, scope: Tuple[str, ...], now: float) -> None:
+        current = self._current_agent.pop(scope, None)
+        if current is not None:
+            agent_name, start = current
+            self.spans.append(
+                Span("agent", (ROOT_FRAME,) + scope + (_frame(agent_name),), start - self._started_at, now - start)
+            )
+
+    @asynccontextmanager
+    async def tool_span(self, agent_name: str, tool_name: str) -> AsyncIterator[None]:
+        stack = self._stack(agent_name, tool_name)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            baseline, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        try:
+            with self._opened(stack):
+                yield
+        finally:
+            end = time.perf_counter()
+            alloc = None
+            if tracing:
+                _, peak = tracemalloc.get_traced_memory()
+                alloc = max(0, peak - baseline)
+            self._add("tool", stack, start, end, alloc)
+
+    def llm_call(self, tier: str, latency_s: float) -> None:
+        """Record a finished LLM call under the agent currently active in this scope."""
+        scope = _SCOPE.get()
+        current = self._current_agent.get(scope)
+        frames = (current[0], f"llm:{tier}") if current else (f"llm:{tier}",)
+        end = time.perf_counter()
+        self._add("llm", self._stack(*frames), end - latency_s, end)
+
+    # ------------------------------------------------------------------
+    def collapsed_stacks(self) -> Dict[Tuple[str, ...], float]:
+        """
+        Self time (ms) per stack: each frame's total minus its direct children's totals.
+        """
+        totals: Dict[Tuple[str, ...], float] = {(ROOT_FRAME,): self._wall_time_s * 1000}
+        for span in self.spans:
+            totals[span.stack] = totals.get(span.stack, 0.0) + span.duration_s * 1000
+
+        children: Dict[Tuple[str, ...], float] = {}
+        for stack, total in totals.items():
+            # 중간 프레임이 없는 스택(예: agent 없이 호출된 llm)은 가장 가까운 조상에 붙임
+            for depth in range(len(stack) - 1, 0, -1):
+                parent = stack[:depth]
+                if parent in totals:
+                    children[parent] = children.get(parent, 0.0) + total
+                    break
+
+        return {stack: max(0.0, total - children.get(stack, 0.0)) for stack, total in totals.items()}
+
+    def _aggregate(self, kind: str, key_depth: int) -> Dict[str, Dict[str, Any]]:
+        result: Dict[str, Dict[str, Any]] = {}
+        for span in self.spans:
+            if span.kind != kind:
+                continue
+            key = ";".join(span.stack[-key_depth:])
+            entry = result.setdefault(key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "alloc_peak_max_kb": None})
+            ms = span.duration_s * 1000
+            entry["count"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + ms, 1)
+            entry["max_ms"] = round(max(entry["max_ms"], ms), 1)
+            if span.alloc_peak_bytes is not None:
+                kb = round(span.alloc_peak_bytes / 1024, 1)
+                entry["alloc_peak_max_kb"] = max(entry["alloc_peak_max_kb"] or 0.0, kb)
+        return dict(sorted(result.items(), key=lambda kv: kv[1]["total_ms"], reverse=True))
+
+    def _loop_lag_summary(self) -> Dict[str, Any]:
+        lags_ms = [lag * 1000 for lag in self.loop_lags]
+        return {
+            "interval_ms": LOOP_LAG_INTERVAL * 1000,
+            "samples": len(lags_ms),
+            "p50_ms": round(_percentile(lags_ms, 0.5), 1),
+            "p95_ms": round(_percentile(lags_ms, 0.95), 1),
+            "p99_ms": round(_percentile(lags_ms, 0.99), 1),
+            "max_ms": round(max(lags_ms, default=0.0), 1),
+            "stalls_over_threshold": sum(1 for lag in self.loop_lags if lag >= LOOP_STALL_THRESHOLD),
+            "stall_threshold_ms": LOOP_STALL_THRESHOLD * 1000,
+            "worst_stalls": sorted(self.stalls, key=lambda s: s["lag_ms"], reverse=True),
+        }
+
+    def _top_allocations(self, limit: int = 15) -> List[Dict[str, Any]]:
+        if not tracemalloc.is_tracing():
+            return []
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:limit]
+        return [{"where": str(stat.traceback), "size_kb": round(stat.size / 1024, 1), "count": stat.count} for stat in stats]
+
+    def _top_functions(self, limit: int = 30) -> str:
+        out = io.StringIO()
+        pstats.Stats(self._cprofile, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def write_report(self, extra: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """
+        Write the report files and return their paths. Only valid after ``stop()``
+        (i.e. after the ``profile_run`` block), once wall time and open spans are final.
+        """
+        if not self._stopped:
+            raise RuntimeError("write_report() called before the profiler was stopped")
+        os.makedirs(self.log_dir, exist_ok=True)
+        base = os.path.join(self.log_dir, f"profile_{time.strftime('%Y%m%d-%H%M%S')}")
+        paths = {"report": f"{base}.json", "collapsed": f"{base}.collapsed"}
+
+        with open(paths["collapsed"], "w", encoding="utf-8") as f:
+            for stack, self_ms in sorted(self.collapsed_stacks().items()):
+                if round(self_ms) > 0:
+                    f.write(f"{';'.join(stack)} {round(self_ms)}\n")
+
+        report: Dict[str, Any] = {
+            "mode": self.mode,
+            "wall_time_s": round(self._wall_time_s, 3),
+            "agents": self._aggregate("agent", 1),
+            "tools": self._aggregate("tool", 2),
+            "llm": self._aggregate("llm", 2),
+            "scopes": self._aggregate("scope", 1),
+            "event_loop_lag": self._loop_lag_summary(),
+            "top_allocations": self._top_allocations(),
+        }
+
+        if self._cprofile is not None:
+            paths["pstats"] = f"{base}.pstats"
+            self._cprofile.dump_stats(paths["pstats"])
+            report["cprofile_top"] = self._top_functions()
+        if self._pyinstrument is not None:
+            paths["html"] = f"{base}.html"
+            with open(paths["html"], "w", encoding="utf-8") as f:
+                f.write(self._pyinstrument.output_html())
+
+        report.update(extra or {})
+        report["files"] = paths
+        report["spans"] = [asdict(span) for span in self.spans]
+
+        with open(paths["report"], "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        return paths
+
+
+# ----------------------------------------------------------------------
+@asynccontextmanager
+async def profile_run(
+    mode: str = "spans", log_dir: str = "./logs", trace_allocations: bool = True
+) -> AsyncIterator[RunProfiler]:
+    """
+    Profile everything awaited inside the block. Call ``write_report`` after the block exits.
+    """
+    profiler = RunProfiler(mode=mode, log_dir=log_dir, trace_allocations=trace_allocations)
+    token = ACTIVE_PROFILER.set(profiler)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        await profiler.stop()
+        ACTIVE_PROFILER.reset(token)
+
+
+@contextmanager
+def profile_scope(name: str) -> Iterator[None]:
+    """Group spans under ``name`` (e.g. one shard or README target) when profiling."""
+    profiler = ACTIVE_PROFILER.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.scope(name):
+        yield
+
+
+def record_llm_call(tier: str, latency_s: float) -> None:
+    profiler = ACTIVE_PROFILER.get()
+    if profiler is not None:
+        profiler.llm_call(tier, latency_s)
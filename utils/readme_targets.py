@@ -0,0 +1,30 @@
+"""
+README output targets (language / path / requirements) shared by the CLI, the
+HTTP service and the batch worker.
+
+Kept free of agent/LLM imports so control-plane commands (e.g. enqueueing
+batch jobs) can build targets without loading the workflow.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+LANGUAGE_NAMES = {"ko": "한국어", "en": "영어(English)", "ja": "일본어(日本語)"}
+
+
+@dataclass
+class ReadmeTarget:
+    language: str
+    path: str = "README.md"  # project_root 기준 상대 경로
+    requirements: Optional[str] = None  # 없으면 공통 user_requirements 사용
+
+
+def targets_from_languages(languages: List[str]) -> List[ReadmeTarget]:
+    """첫 번째 언어는 README.md, 나머지는 README.<lang>.md 로 저장"""
+    return [
+        ReadmeTarget(
+            language=lang,
+            path="README.md" if i == 0 else f"README.{lang}.md",
+            requirements=f"README는 {LANGUAGE_NAMES.get(lang, lang)}로 작성하고, 설치/실행 예제를 꼭 포함해주세요.",
+        )
+        for i, lang in enumerate(languages)
+    ]
@@ -0,0 +1,148 @@
+"""
+Split a monorepo into independently analyzable shards.
+
+A shard is either a nested sub-project (a directory below the root holding a
+project manifest such as pyproject.toml / package.json / setup.py) or a
+top-level directory whose file count exceeds a threshold. Whatever is left
+(root-level files and small directories) becomes a "(root)" shard that skips
+the other shards' directories. Projects with fewer than ``min_project_files``
+files are never split: a single agent covers them faster than a fan-out.
+"""
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from tools.file_viewer_tools import in_skipped_dir, is_skipped_dir
+from utils.budget import measure_project
+from utils.git_index import tracked_files
+
+PROJECT_MANIFESTS = {
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "package.json",
+    "Cargo.toml",
+    "go.mod",
+    "pom.xml",
+    "build.gradle",
+    "build.gradle.kts",
+}
+
+ROOT_SHARD_NAME = "(root)"
+
+
+@dataclass
+class Shard:
+    name: str
+    path: str
+    reason: str
+    file_count: int = 0
+    total_bytes: int = 0
+    exclude: List[str] = field(default_factory=list)
+
+
+def _find_nested_manifest_dirs(root: Path) -> List[Path]:
+    """
+    Return the outermost directories below ``root`` that contain a project manifest.
+    Git repositories are searched in the index (tracked files only) instead of the working tree.
+    """
+    tracked = tracked_files(str(root))
+    if tracked is not None:
+        manifest_dirs: Set[Tuple[str, ...]] = set()
+        for rel_path, _ in tracked:
+            *rel_dirs, name = rel_path.split("/")
+            if not rel_dirs or name not in PROJECT_MANIFESTS or in_skipped_dir(rel_path):
+                continue
+            manifest_dirs.add(tuple(rel_dirs))
+
+        # 정렬하면 상위 디렉토리가 하위보다 먼저 오므로, 이미 찾은 디렉토리 아래는 건너뜀
+        outermost: List[Tuple[str, ...]] = []
+        for dirs in sorted(manifest_dirs):
+            if not any(dirs[: len(parent)] == parent for parent in outermost):
+                outermost.append(dirs)
+        return [root.joinpath(*dirs) for dirs in outermost]
+
+    found: List[Path] = []
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        current = Path(dirpath)
+        dirnames[:] = sorted(d for d in dirnames if not is_skipped_dir(d))
+
+        if current != root and PROJECT_MANIFESTS.intersection(filenames):
+            found.append(current)
+            # 하위 프로젝트 안쪽의 중첩 manifest 는 같은 shard 로 취급
+            dirnames[:] = []
+
+    return found
+
+
+def detect_shards(
+    project_root: str,
+    min_files_per_dir: int = 400,
+    min_shards: int = 2,
+    min_project_files: Optional[int] = None,
+) -> List[Shard]:
+    """
+    Detect sub-project shards. Returns an empty list when the project does not look like
+    a monorepo (fewer than ``min_shards`` shards besides the root remainder) or has fewer
+    than ``min_project_files`` files (default: ``min_files_per_dir * min_shards``).
+    """
+    root = Path(project_root).resolve()
+    if min_project_files is None:
+        min_project_files = min_files_per_dir * min_shards
+    if measure_project(str(root))[0] < min_project_files:
+        return []
+
+    shards: List[Shard] = []
+    covered: List[Path] = []
+
+    for sub in _find_nested_manifest_dirs(root):
+        file_count, total_bytes = measure_project(str(sub))
+        shards.append(
+            Shard(
+                name=str(sub.relative_to(root)),
+                path=str(sub),
+                reason="nested project manifest",
+                file_count=file_count,
+                total_bytes=total_bytes,
+            )
+        )
+        covered.append(sub)
+
+    for child in sorted(root.iterdir()):
+        if not child.is_dir() or is_skipped_dir(child.name):
+            continue
+        # 이미 sub-project 를 포함하는 디렉토리는 그 shard 들로 충분
+        if any(c == child or child in c.parents for c in covered):
+            continue
+
+        file_count, total_bytes = measure_project(str(child))
+        if file_count > min_files_per_dir:
+            shards.append(
+                Shard(
+                    name=child.name,
+                    path=str(child),
+                    reason=f"large top-level directory ({file_count} files)",
+                    file_count=file_count,
+                    total_bytes=total_bytes,
+                )
+            )
+            covered.append(child)
+
+    if len(shards) < min_shards:
+        return []
+
+    exclude = [str(c) for c in covered]
+    file_count, total_bytes = measure_project(str(root), exclude=exclude)
+    shards.append(
+        Shard(
+            name=ROOT_SHARD_NAME,
+            path=str(root),
+            reason="root-level files and directories not covered by other shards",
+            file_count=file_count,
+            total_bytes=total_bytes,
+            exclude=exclude,
+        )
+    )
+    return shards
@@ -0,0 +1,509 @@
+"""
+Shared work queue with visibility-timeout leases for multi-node batch runs.
+
+Any number of workers (processes or machines) claim items from one queue. A
+claim grants a lease for ``lease_seconds``; the worker extends it with
+heartbeats while it runs. If the worker dies, the lease expires and the item
+becomes claimable again. Every claim carries a fresh lease token, and
+heartbeat/complete/fail are fenced by it, so a worker whose lease was taken
+over can no longer report for the item. Items that fail ``max_attempts`` times
+(including expired leases) move to the dead-letter state with their last error.
+
+Items are deduplicated by key (see ``utils.job_queue.project_job_key``): a
+project that is already queued or leased is not enqueued twice, and a project
+whose previous run finished is reset and queued again.
+
+Backends:
+  SQLiteWorkQueue      one database file; workers on one host, or hosts sharing a
+                       filesystem with working POSIX locks (rollback journal, no WAL)
+  FileSystemWorkQueue  one JSON file per item moved between state directories
+                       with atomic renames (through a private staging name, so
+                       writes never race a reclaim); works on any shared
+                       filesystem with atomic rename
+"""
+import abc
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+DEAD = "dead"
+
+STATES = (QUEUED, LEASED, DONE, DEAD)
+
+# 파일시스템 백엔드: 상태를 옮기는 도중(moving/) 워커가 죽은 항목을 회수하기까지의 유예 시간
+MOVING = "moving"
+MOVE_GRACE_SECONDS = 60.0
+
+
+@dataclass
+class WorkItem:
+    item_id: str
+    key: str
+    params: Dict[str, Any]
+    priority: int = 0
+    attempts: int = 0
+    lease_owner: Optional[str] = None
+    lease_token: Optional[str] = None
+    lease_until: Optional[float] = None
+    available_at: float = 0.0
+    created_at: float = field(default_factory=time.time)
+    status: str = QUEUED
+    error: Optional[str] = None
+    result: Any = None
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+class WorkQueue(abc.ABC):
+    """
+    Backend interface. All methods are synchronous; call them through
+    ``asyncio.to_thread`` from async code.
+    """
+
+    def __init__(self, max_attempts: int = 3) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        self.max_attempts = max_attempts
+
+    @abc.abstractmethod
+    def enqueue(self, key: str, params: Dict[str, Any], priority: int = 0) -> Tuple[str, bool]:
+        """Returns (item_id, deduplicated)."""
+
+    @abc.abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[WorkItem]:
+        """Lease the next available item (lowest priority number first), or None."""
+
+    @abc.abstractmethod
+    def heartbeat(self, item: WorkItem, lease_seconds: float) -> bool:
+        """Extend the lease. False means the lease was lost and the work must stop."""
+
+    @abc.abstractmethod
+    def complete(self, item: WorkItem, result: Any, metrics: Dict[str, Any]) -> bool:
+        """Record the result. False means the lease was already lost."""
+
+    @abc.abstractmethod
+    def fail(self, item: WorkItem, error: str, retry_delay: float = 0.0) -> Optional[str]:
+        """
+        Record a failed attempt. Returns the new status (QUEUED for retry, DEAD once
+        max_attempts is reached) or None when the lease was already lost.
+        """
+
+    @abc.abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """Item count per state."""
+
+    @abc.abstractmethod
+    def items(self, status: Optional[str] = None) -> List[WorkItem]:
+        """Items in ``status`` (all states when None), oldest first."""
+
+
+# ----------------------------------------------------------------------
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_items (
+    item_id      TEXT PRIMARY KEY,
+    key          TEXT NOT NULL UNIQUE,
+    params       TEXT NOT NULL,
+    priority     INTEGER NOT NULL DEFAULT 0,
+    status       TEXT NOT NULL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner  TEXT,
+    lease_token  TEXT,
+    lease_until  REAL,
+    result       TEXT,
+    metrics      TEXT,
+    error        TEXT,
+    created_at   REAL NOT NULL,
+    updated_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS work_items_claim ON work_items (status, priority, created_at);
+"""
+
+
+class SQLiteWorkQueue(WorkQueue):
+    def __init__(self, path: str, max_attempts: int = 3, busy_timeout_s: float = 30.0) -> None:
+        super().__init__(max_attempts)
+        self.path = str(path)
+        self._busy_timeout_s = busy_timeout_s
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # 호출마다 새 연결 (스레드/프로세스 간 공유하지 않음), 트랜잭션은 직접 관리
+        conn = sqlite3.connect(self.path, timeout=self._busy_timeout_s, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _to_item(self, row: sqlite3.Row) -> WorkItem:
+        return WorkItem(
+            item_id=row["item_id"],
+            key=row["key"],
+            params=json.loads(row["params"]),
+            priority=row["priority"],
+            attempts=row["attempts"],
+            lease_owner=row["lease_owner"],
+            lease_token=row["lease_token"],
+            lease_until=row["lease_until"],
+            available_at=row["available_at"],
+            created_at=row["created_at"],
+            status=row["status"],
+            error=row["error"],
+            result=json.loads(row["result"]) if row["result"] else None,
+            metrics=json.loads(row["metrics"]) if row["metrics"] else {},
+        )
+
+    # ------------------------------------------------------------------
+    def enqueue(self, key: str, params: Dict[str, Any], priority: int = 0) -> Tuple[str, bool]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT item_id, status, priority FROM work_items WHERE key = ?", (key,)).fetchone()
+
+            if row is not None and row["status"] in (QUEUED, LEASED):
+                if row["status"] == QUEUED and priority < row["priority"]:
+                    conn.execute("UPDATE work_items SET priority = ? WHERE item_id = ?", (priority, row["item_id"]))
+                conn.execute("COMMIT")
+                return row["item_id"], True
+
+            item_id = uuid.uuid4().hex
+            if row is not None:
+                # 이전 실행이 끝난 프로젝트 → 같은 키로 다시 대기열에 올림
+                conn.execute("DELETE FROM work_items WHERE item_id = ?", (row["item_id"],))
+            conn.execute(
+                "INSERT INTO work_items (item_id, key, params, priority, status, attempts, available_at, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?)",
+                (item_id, key, json.dumps(params, ensure_ascii=False), priority, QUEUED, now, now, now),
+            )
+            conn.execute("COMMIT")
+            return item_id, False
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[WorkItem]:
+        now = time.time()
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE: 쓰기 잠금을 먼저 잡아 두 워커가 같은 항목을 가져가지 않도록 함
+            conn.execute("BEGIN IMMEDIATE")
+
+            # 만료된 lease 중 시도 횟수를 다 쓴 항목은 dead-letter 로
+            conn.execute(
+                "UPDATE work_items SET status = ?, error = COALESCE(error, 'lease expired'), "
+                "lease_token = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (DEAD, now, LEASED, now, self.max_attempts),
+            )
+
+            row = conn.execute(
+                "SELECT * FROM work_items "
+                "WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_until < ?) "
+                "ORDER BY priority, created_at LIMIT 1",
+                (QUEUED, now, LEASED, now),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            token = uuid.uuid4().hex
+            conn.execute(
+                "UPDATE work_items SET status = ?, attempts = attempts + 1, lease_owner = ?, "
+                "lease_token = ?, lease_until = ?, updated_at = ? WHERE item_id = ?",
+                (LEASED, worker_id, token, now + lease_seconds, now, row["item_id"]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        item = self._to_item(row)
+        item.status = LEASED
+        item.attempts += 1
+        item.lease_owner = worker_id
+        item.lease_token = token
+        item.lease_until = now + lease_seconds
+        return item
+
+    def _fenced_update(self, item: WorkItem, assignments: str, values: tuple) -> bool:
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"UPDATE work_items SET {assignments}, updated_at = ? "
+                "WHERE item_id = ? AND status = ? AND lease_token = ?",
+                (*values, time.time(), item.item_id, LEASED, item.lease_token),
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def heartbeat(self, item: WorkItem, lease_seconds: float) -> bool:
+        lease_until = time.time() + lease_seconds
+        if self._fenced_update(item, "lease_until = ?", (lease_until,)):
+            item.lease_until = lease_until
+            return True
+        return False
+
+    def complete(self, item: WorkItem, result: Any, metrics: Dict[str, Any]) -> bool:
+        return self._fenced_update(
+            item,
+            "status = ?, result = ?, metrics = ?, error = NULL, lease_token = NULL",
+            (DONE, json.dumps(result, ensure_ascii=False), json.dumps(metrics, ensure_ascii=False)),
+        )
+
+    def fail(self, item: WorkItem, error: str, retry_delay: float = 0.0) -> Optional[str]:
+        status = DEAD if item.attempts >= self.max_attempts else QUEUED
+        ok = self._fenced_update(
+            item,
+            "status = ?, error = ?, available_at = ?, lease_owner = NULL, lease_token = NULL, lease_until = NULL",
+            (status, error, time.time() + retry_delay),
+        )
+        return status if ok else None
+
+    def stats(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM work_items GROUP BY status").fetchall()
+        finally:
+            conn.close()
+        return {state: 0 for state in STATES} | {row["status"]: row["n"] for row in rows}
+
+    def items(self, status: Optional[str] = None) -> List[WorkItem]:
+        conn = self._connect()
+        try:
+            if status is None:
+                rows = conn.execute("SELECT * FROM work_items ORDER BY created_at").fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM work_items WHERE status = ? ORDER BY created_at", (status,)
+                ).fetchall()
+        finally:
+            conn.close()
+        return [self._to_item(row) for row in rows]
+
+
+# ----------------------------------------------------------------------
+class FileSystemWorkQueue(WorkQueue):
+    """
+    ``<root>/<state>/<key>.json``; a leased item is ``leased/<key>.<lease token>.json``.
+
+    Every state change first takes the item file with an atomic rename to a private
+    name in ``moving/``, rewrites it there and renames it to its destination. Only one
+    caller can take a file, and a file is never written at a path another worker can
+    move, so a reclaim racing a heartbeat or completion cannot leave the item both
+    queued and leased. A worker that stalls between the take and the final rename for
+    longer than MOVE_GRACE_SECONDS past its lease loses the item to a reclaim.
+    """
+
+    def __init__(self, root: str, max_attempts: int = 3) -> None:
+        super().__init__(max_attempts)
+        self.root = Path(root)
+        for state in (*STATES, MOVING):
+            (self.root / state).mkdir(parents=True, exist_ok=True)
+
+    def _path(self, state: str, key: str) -> Path:
+        return self.root / state / f"{key}.json"
+
+    def _leased_path(self, item: WorkItem) -> Path:
+        return self.root / LEASED / f"{item.key}.{item.lease_token}.json"
+
+    def _write(self, path: Path, item: WorkItem) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, prefix=".item.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(vars(item), f, ensure_ascii=False)
+            os.replace(tmp_name, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+    def _read(self, path: Path) -> Optional[WorkItem]:
+        try:
+            return WorkItem(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _take(self, path: Path) -> Optional[Path]:
+        """Move ``path`` to a private name in moving/ (exactly one caller wins), or None."""
+        key = path.name.split(".", 1)[0]
+        staging = self.root / MOVING / f"{key}.{uuid.uuid4().hex}.json"
+        now = time.time()
+        try:
+            # rename 은 mtime 을 유지하므로 먼저 갱신 → 옮기는 중인 파일이 바로 stale 로 보이지 않음
+            os.utime(path, (now, now))
+            os.rename(path, staging)
+        except FileNotFoundError:
+            return None
+        return staging
+
+    def _publish(self, staging: Path, item: WorkItem, target: Path) -> None:
+        self._write(staging, item)
+        os.rename(staging, target)
+
+    # ------------------------------------------------------------------
+    def enqueue(self, key: str, params: Dict[str, Any], priority: int = 0) -> Tuple[str, bool]:
+        active = [self._path(QUEUED, key)]
+        for state in (LEASED, MOVING):
+            active.extend((self.root / state).glob(f"{key}.*.json"))
+        for path in active:
+            existing = self._read(path)
+            if existing is not None:
+                return existing.item_id, True
+
+        item = WorkItem(item_id=uuid.uuid4().hex, key=key, params=params, priority=priority)
+        self._write(self._path(QUEUED, key), item)
+        # 이전 실행 결과는 새 작업이 대기열에 오른 뒤 제거
+        for state in (DONE, DEAD):
+            try:
+                self._path(state, key).unlink()
+            except FileNotFoundError:
+                pass
+        return item.item_id, False
+
+    def _requeue(self, staging: Path) -> None:
+        item = self._read(staging)
+        if item is None:
+            return
+        target_state = DEAD if item.attempts >= self.max_attempts else QUEUED
+        item.status = target_state
+        item.lease_owner = item.lease_token = item.lease_until = None
+        item.error = item.error or "lease expired"
+        self._publish(staging, item, self._path(target_state, item.key))
+
+    def _reclaim_expired(self, now: float) -> None:
+        for path in (self.root / LEASED).glob("*.json"):
+            item = self._read(path)
+            if item is None or (item.lease_until or 0.0) >= now:
+                continue
+            staging = self._take(path)
+            if staging is not None:
+                self._requeue(staging)
+
+        # 옮기는 도중 워커가 죽은 항목: lease 와 마지막 수정 시각 모두 유예 시간을 넘긴 경우만 회수
+        for path in (self.root / MOVING).glob("*.json"):
+            item = self._read(path)
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if item is None or max(item.lease_until or 0.0, mtime) + MOVE_GRACE_SECONDS >= now:
+                continue
+            staging = self._take(path)
+            if staging is not None:
+                self._requeue(staging)
+
+    def claim(self, worker_id: str, lease_seconds: float) -> Optional[WorkItem]:
+        now = time.time()
+        self._reclaim_expired(now)
+
+        candidates = []
+        for path in (self.root / QUEUED).glob("*.json"):
+            item = self._read(path)
+            if item is not None and item.available_at <= now:
+                candidates.append((item.priority, item.created_at, path))
+
+        for _, _, path in sorted(candidates):
+            staging = self._take(path)
+            if staging is None:
+                continue  # 다른 워커가 먼저 가져감
+
+            item = self._read(staging)
+            if item is None:
+                os.rename(staging, path)
+                continue
+            item.status = LEASED
+            item.attempts += 1
+            item.lease_owner = worker_id
+            item.lease_token = uuid.uuid4().hex
+            item.lease_until = time.time() + lease_seconds
+            self._publish(staging, item, self._leased_path(item))
+            return item
+
+        return None
+
+    def heartbeat(self, item: WorkItem, lease_seconds: float) -> bool:
+        leased_path = self._leased_path(item)
+        staging = self._take(leased_path)
+        if staging is None:
+            return False  # 회수되었거나 다른 상태로 이동됨
+
+        current = self._read(staging) or item
+        current.lease_until = item.lease_until = time.time() + lease_seconds
+        self._publish(staging, current, leased_path)
+        return True
+
+    def _finish(self, item: WorkItem, state: str) -> bool:
+        staging = self._take(self._leased_path(item))
+        if staging is None:
+            return False
+
+        item.status = state
+        item.lease_owner = item.lease_token = item.lease_until = None
+        self._publish(staging, item, self._path(state, item.key))
+        return True
+
+    def complete(self, item: WorkItem, result: Any, metrics: Dict[str, Any]) -> bool:
+        item.result = result
+        item.metrics = metrics
+        item.error = None
+        return self._finish(item, DONE)
+
+    def fail(self, item: WorkItem, error: str, retry_delay: float = 0.0) -> Optional[str]:
+        status = DEAD if item.attempts >= self.max_attempts else QUEUED
+        item.error = error
+        item.available_at = time.time() + retry_delay
+        return status if self._finish(item, status) else None
+
+    def stats(self) -> Dict[str, int]:
+        counts = {state: sum(1 for _ in (self.root / state).glob("*.json")) for state in STATES}
+        # 옮기는 중인 항목은 lease 상태로 집계
+        counts[LEASED] += sum(1 for _ in (self.root / MOVING).glob("*.json"))
+        return counts
+
+    def items(self, status: Optional[str] = None) -> List[WorkItem]:
+        result = []
+        for state in (status,) if status else STATES:
+            for path in (self.root / state).glob("*.json"):
+                item = self._read(path)
+                if item is not None:
+                    result.append(item)
+        return sorted(result, key=lambda i: i.created_at)
+
+
+# ----------------------------------------------------------------------
+WORK_QUEUE_BACKENDS: Dict[str, Type[WorkQueue]] = {
+    "sqlite": SQLiteWorkQueue,
+    "fs": FileSystemWorkQueue,
+}
+
+
+def open_work_queue(backend: str, location: str, max_attempts: int = 3) -> WorkQueue:
+    """
+    backend: "sqlite" (location = database file) or "fs" (location = shared directory).
+    """
+    try:
+        backend_cls = WORK_QUEUE_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"unknown work queue backend {backend!r} (expected one of {list(WORK_QUEUE_BACKENDS)})")
+    return backend_cls(location, max_attempts=max_attempts)